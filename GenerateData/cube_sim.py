@@ -1,77 +1,36 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from collections import deque
-from tqdm import tqdm
-import pandas as pd
+import os
+from percolation import lattice
+from percolation.lattice import center_site, cube_bond_pairs, bonds_to_csr
+from percolation.labeling import label_csr, cluster_stats
+from percolation.runner import sweep, to_frame
 
 def generate_cube(L, p, seed=None):
-    rng = np.random.default_rng(seed)
-    x_bonds = rng.random((L, L, L - 1)) < p
-    y_bonds = rng.random((L, L - 1, L)) < p
-    z_bonds = rng.random((L - 1, L, L)) < p
-    return x_bonds, y_bonds, z_bonds
+    return lattice.generate_cube(L, p, np.random.default_rng(seed))
 
 def build_adjacency(L, x_bonds, y_bonds, z_bonds):
-    graph = {(i, j, k): [] for i in range(L) for j in range(L) for k in range(L)}
-    for i in range(L):
-        for j in range(L):
-            for k in range(L - 1):
-                if x_bonds[i, j, k]:
-                    graph[(i, j, k)].append((i, j, k + 1))
-                    graph[(i, j, k + 1)].append((i, j, k))
-    for i in range(L):
-        for j in range(L - 1):
-            for k in range(L):
-                if y_bonds[i, j, k]:
-                    graph[(i, j, k)].append((i, j + 1, k))
-                    graph[(i, j + 1, k)].append((i, j, k))
-    for i in range(L - 1):
-        for j in range(L):
-            for k in range(L):
-                if z_bonds[i, j, k]:
-                    graph[(i, j, k)].append((i + 1, j, k))
-                    graph[(i + 1, j, k)].append((i, j, k))
-    return graph
+    return bonds_to_csr(L ** 3, cube_bond_pairs(x_bonds, y_bonds, z_bonds))
 
 def cluster_size_from_center(L, graph):
-    center = (L // 2, L // 2, L // 2)
-    visited = set([center])
-    queue = deque([center])
-    while queue:
-        node = queue.popleft()
-        for neighbor in graph[node]:
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append(neighbor)
-    return len(visited)
+    return cluster_stats(label_csr(*graph), origin=center_site(L, 3))["origin"]
 
-def simulate(L, p_values, num_trials):
-    mean_sizes = []
-    for p in tqdm(p_values):
-        sizes = []
-        for trial in range(num_trials):
-            x_bonds, y_bonds, z_bonds = generate_cube(L, p, seed=trial)
-            graph = build_adjacency(L, x_bonds, y_bonds, z_bonds)
-            sizes.append(cluster_size_from_center(L, graph))
-        mean_sizes.append(np.mean(sizes))
-    return mean_sizes
+def simulate(L, p_values, num_trials, workers=1, store=None):
+    return sweep("cube", L, p_values, num_trials, workers=workers, seed=0, store=store)
 
 
-L = 35
-p_values = np.linspace(0.1, 0.4, 30)
-num_trials = 30
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
+    L = 35
+    p_values = np.linspace(0.1, 0.4, 30)
+    num_trials = 30
+    workers = os.cpu_count()
 
-mean_sizes = simulate(L, p_values, num_trials)
-plt.figure(figsize=(8, 5))
-plt.plot(p_values, mean_sizes, color='blue', label="Cube")
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.show()
-
-df = pd.DataFrame({
-    "p": p_values,
-    "mean_cluster_size": mean_sizes
-})
-df.to_csv("cube_lattice_data.csv", index=False)
\ No newline at end of file
+    stats = simulate(L, p_values, num_trials, workers, store="cube_lattice_data")
+    to_frame(p_values, stats).to_csv("cube_lattice_data.csv", index=False)
+    plt.figure(figsize=(8, 5))
+    plt.plot(p_values, stats["origin"]["mean"], color='blue', label="Cube")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
@@ -1,64 +1,38 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import networkx as nx
-import random
-import pandas as pd
-from tqdm import tqdm
+import os
+from percolation import lattice
+from percolation.lattice import center_site, square_bond_pairs, bonds_to_csr
+from percolation.labeling import label_csr, cluster_stats
+from percolation.runner import sweep, to_frame
 
 
-def generate_square(n):
-    G = nx.grid_2d_graph(n, n)
-    return G
+def generate_square(L, p, seed=None):
+    return lattice.generate_square(L, p, np.random.default_rng(seed))
 
-def percolate(G, p):
-    H = nx.Graph()
-    H.add_nodes_from(G.nodes)
-    for edge in G.edges:
-        if random.random() < p:
-            H.add_edge(*edge)
-    return H
+def build_adjacency(L, h_bonds, v_bonds):
+    return bonds_to_csr(L * L, square_bond_pairs(h_bonds, v_bonds))
 
-def cluster_from_origin(G, origin):
-    if origin not in G:
-        return 0
-    try:
-        cluster = nx.node_connected_component(G, origin)
-        return len(cluster)
-    except:
-        return 0
+def cluster_size_from_center(L, graph):
+    return cluster_stats(label_csr(*graph), origin=center_site(L, 2))["origin"]
 
-def simulate(n, p_values, num_trials):
-    mean_cluster_sizes = []
-    base_graph = generate_square(n)
-    origin = (n//2, n//2)
+def simulate(n, p_values, num_trials, workers=1, store=None):
+    return sweep("square", n, p_values, num_trials, workers=workers, seed=0, store=store)
 
-    for p in tqdm(p_values):
-        sizes = []
-        for _ in range(num_trials):
-            H = percolate(base_graph, p)
-            size = cluster_from_origin(H, origin)
-            sizes.append(size)
-        mean_cluster_sizes.append(np.mean(sizes))
-    
-    return mean_cluster_sizes
 
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
-lattice_size = 200
-num_trials = 30
-p_values = np.linspace(0.1, 0.9, 30)
+    lattice_size = 200
+    num_trials = 30
+    p_values = np.linspace(0.1, 0.9, 30)
+    workers = os.cpu_count()
 
-mean_sizes = simulate(lattice_size, p_values, num_trials)
-
-plt.figure(figsize=(8, 5))
-plt.plot(p_values, mean_sizes, color='blue')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.show()
-
-df = pd.DataFrame({
-    "p": p_values,
-    "mean_cluster_size": mean_sizes
-})
-df.to_csv("square_lattice_data.csv", index=False)
+    stats = simulate(lattice_size, p_values, num_trials, workers, store="square_lattice_data")
+    to_frame(p_values, stats).to_csv("square_lattice_data.csv", index=False)
 
+    plt.figure(figsize=(8, 5))
+    plt.plot(p_values, stats["origin"]["mean"], color='blue')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
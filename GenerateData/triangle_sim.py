@@ -1,77 +1,35 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from collections import deque
-from tqdm import tqdm
-import pandas as pd
+import os
+from percolation.lattice import (generate_triangle, center_site, triangle_bond_pairs,
+                                 bonds_to_csr)
+from percolation.labeling import label_csr, cluster_stats
+from percolation.runner import sweep, to_frame
 
 
 
-def generate_triangle(L, p, rng):
-    bonds = []
-    for i in range(L):
-        for j in range(L):
-            neighbors = []
-            if j + 1 < L:
-                neighbors.append(((i, j), (i, j + 1)))
-            if i + 1 < L:
-                neighbors.append(((i, j), (i + 1, j)))
-            if i + 1 < L and j - 1 >= 0 and i % 2 == 1:
-                neighbors.append(((i, j), (i + 1, j - 1)))
-            if i + 1 < L and j + 1 < L and i % 2 == 0:
-                neighbors.append(((i, j), (i + 1, j + 1)))
-            for (a, b) in neighbors:
-                if rng.random() < p:
-                    bonds.append((a, b))
-    return bonds
-
 def build_adjacency(L, bonds):
-    graph = { (i, j): [] for i in range(L) for j in range(L) }
-    for (node1, node2) in bonds:
-        graph[node1].append(node2)
-        graph[node2].append(node1)
-    return graph
+    return bonds_to_csr(L * L, triangle_bond_pairs(*bonds))
 
 def cluster_size_from_center(L, graph):
-    center = (L // 2, L // 2)
-    visited = set()
-    queue = deque([center])
-    visited.add(center)
-    while queue:
-        node = queue.popleft()
-        for neighbor in graph[node]:
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append(neighbor)
-    return len(visited)
+    return cluster_stats(label_csr(*graph), origin=center_site(L, 2))["origin"]
+
+def simulate(L, p_values, num_trials, workers=1, store=None):
+    return sweep("triangle", L, p_values, num_trials, workers=workers, seed=42, store=store)
 
-def simulate():
-    results = []
-    rng = np.random.default_rng(42)
-    for p in tqdm(p_values):
-        sizes = []
-        for _ in range(num_trials):
-            bonds = generate_triangle(L, p, rng)
-            graph = build_adjacency(L, bonds)
-            size = cluster_size_from_center(L, graph)
-            sizes.append(size)
-        mean_size = np.mean(sizes)
-        results.append(mean_size)
-    return results
 
-L = 200
-num_trials = 30
-p_values = np.linspace(0.1, 1.0, 30)
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
-mean_sizes = simulate()
-plt.figure(figsize=(8, 5))
-plt.plot(p_values, mean_sizes, color='blue')
-plt.grid(True)
-plt.legend()
-plt.tight_layout()
-plt.show()
+    L = 200
+    num_trials = 30
+    p_values = np.linspace(0.1, 1.0, 30)
+    workers = os.cpu_count()
 
-df = pd.DataFrame({
-    "p": p_values,
-    "mean_cluster_size": mean_sizes
-})
-df.to_csv("triangle_lattice_data.csv", index=False)
+    stats = simulate(L, p_values, num_trials, workers, store="triangle_lattice_data")
+    to_frame(p_values, stats).to_csv("triangle_lattice_data.csv", index=False)
+    plt.figure(figsize=(8, 5))
+    plt.plot(p_values, stats["origin"]["mean"], color='blue')
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
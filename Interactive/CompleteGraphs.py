@@ -3,8 +3,8 @@ import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button
 from matplotlib.collections import LineCollection
 import matplotlib.gridspec as gridspec
-from collections import deque
 import random
+from percolation.timeline import build_timeline, timeline_labels
 
 
 num_vertices = 50 
@@ -16,160 +16,109 @@ spacing = 2
 def generate_Kn(num_vertices):
     # Circle
     angles = np.linspace(0, 2 * np.pi, num_vertices, endpoint=False)
-    positions = [(np.cos(angle), np.sin(angle)) for angle in angles]
-
-    edges = []
-    for i in range(num_vertices):
-        for j in range(i + 1, num_vertices):
-            edges.append((i, j))
-
+    positions = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    edges = np.stack(np.triu_indices(num_vertices, 1), axis=1)
     return positions, edges
 
 
-def percolate(edges, p, seed=None):
+def edge_thresholds(edges, seed=None):
+    # Edge k is open whenever thresholds[k] < p (same draws as one
+    # rng.random() per edge), so a new p never needs new random numbers.
     rng = np.random.default_rng(seed)
-    selected_edges = [edge for edge in edges if rng.random() < p]
-    return selected_edges
-
-
-def components_BFS(num_vertices, selected_edges):
-    # Adj
-    adj_list = {i: [] for i in range(num_vertices)}
-    for i, j in selected_edges:
-        adj_list[i].append(j)
-        adj_list[j].append(i)
-
-    visited = [False] * num_vertices
-    components = []
-
-    for vertex in range(num_vertices):
-        if not visited[vertex]:
-            component = bfs(vertex, visited, adj_list)
-            components.append(component)
+    return rng.random(len(edges))
 
-    return components
 
+def component_keys(labels):
+    # Key each component by its smallest vertex. When two components merge
+    # the result keeps the smaller key, so colours stay put as p grows.
+    smallest = np.full(labels.max() + 1, len(labels))
+    np.minimum.at(smallest, labels, np.arange(len(labels)))
+    return smallest[labels]
 
 
-def bfs(start, visited, adj_list):
-    component = []
-    queue = deque([start])
-    visited[start] = True
-    while queue:
-        node = queue.popleft()
-        component.append(node)
-        for neighbor in adj_list[node]:
-            if not visited[neighbor]:
-                visited[neighbor] = True
-                queue.append(neighbor)
-    return component
-    
+def get_colored_bond_lines(edges, open_edges, keys, palette):
+    # One RGBA row per edge, transparent when the edge is closed
+    colors = np.zeros((len(edges), 4))
+    colors[open_edges, :3] = palette[keys[edges[open_edges, 0]]]
+    colors[open_edges, 3] = 1
+    return colors
 
 
-def get_colored_bond_lines(positions, edges, selected_edges, components, component_colors):
-    colored_lines = []
+def recolor(p):
+    keys = component_keys(timeline_labels(timeline, p))
+    lc_all.set_color(get_colored_bond_lines(edges, thresholds < p, keys, palette))
 
-    for i, j in selected_edges:
-        x1, y1 = positions[i]
-        x2, y2 = positions[j]
-        line = [(x1 * spacing, y1 * spacing), (x2 * spacing, y2 * spacing)]
+    # Plot vertex by color
+    vertex_dots.set_facecolor(palette[keys])
+    vertex_dots.set_edgecolor(palette[keys])
 
-        component = None
-        for comp in components:
-            if i in comp and j in comp:
-                component = tuple(sorted(comp))
-                break
 
-        # get current color
-        color = component_colors[component]
-        colored_lines.append((line, color))
+def update(val):
+    global seed
 
-    return colored_lines
+    p = slider.val
+    recolor(p)
 
+    title.set_text(f"Bond Percolation (n = {num_vertices}, p = {p:.2f}, seed = {seed})")
+    fig.canvas.draw_idle()
 
-fig = plt.figure(figsize=(10, 8))
-gs = gridspec.GridSpec(1, 2, width_ratios=[4, 1])
 
-ax = fig.add_subplot(gs[0])
-ax.set_aspect('equal')
-ax.set_xlim(-spacing, spacing)
-ax.set_ylim(-spacing, spacing)
-ax.axis('off')
+def change_seed(event):
+    global seed, thresholds, timeline
+    seed += 1
+    thresholds = edge_thresholds(edges, seed)
+    timeline = build_timeline(num_vertices, edges, thresholds)
+    update(None)
 
-control_ax = fig.add_subplot(gs[1])
-control_ax.axis('off')
 
-title = ax.set_title(f"Bond Percolation (n = {num_vertices}, p = {initial_p:.2f}, seed = {seed})", color='black', fontsize=16, ha="center")
+def build_figure():
+    # Figure, graph and widgets; nothing is created at import time
+    global fig, ax, title, positions, edges, thresholds, timeline, palette, lc_all, vertex_dots, slider, seed_button
+    fig = plt.figure(figsize=(10, 8))
+    gs = gridspec.GridSpec(1, 2, width_ratios=[4, 1])
 
-# Init
-positions, edges = generate_Kn(num_vertices)
-selected_edges = percolate(edges, initial_p, seed)
-components = components_BFS(num_vertices, selected_edges)
-component_colors = {tuple(sorted(component)): (random.random(), random.random(), random.random()) for component in components}
+    ax = fig.add_subplot(gs[0])
+    ax.set_aspect('equal')
+    ax.set_xlim(-spacing, spacing)
+    ax.set_ylim(-spacing, spacing)
+    ax.axis('off')
 
-# Use correct colors
-colored_lines = get_colored_bond_lines(positions, edges, selected_edges, components, component_colors)
-lines = [line for line, color in colored_lines]
-colors = [color for line, color in colored_lines]
-lc_all = LineCollection(lines, colors=colors, linewidths=1)
-ax.add_collection(lc_all)
+    control_ax = fig.add_subplot(gs[1])
+    control_ax.axis('off')
 
-# Plot vertex by color
-for i, position in enumerate(positions):
-    vertex_color = None
-    for comp in components:
-        if i in comp:
-            vertex_color = component_colors[tuple(sorted(comp))]
-            break
-    ax.plot(position[0] * spacing, position[1] * spacing, 'o', markersize=8, color=vertex_color)
+    title = ax.set_title(f"Bond Percolation (n = {num_vertices}, p = {initial_p:.2f}, seed = {seed})", color='black', fontsize=16, ha="center")
 
+    # Init
+    positions, edges = generate_Kn(num_vertices)
+    thresholds = edge_thresholds(edges, seed)
+    timeline = build_timeline(num_vertices, edges, thresholds)
 
-# Sidebar
-slider_ax = fig.add_axes([0.83, 0.45, 0.03, 0.4])
-slider = Slider(slider_ax, 'p', 0.0, 0.15, valinit=initial_p, orientation='vertical')
-button_ax = fig.add_axes([0.78, 0.2, 0.15, 0.05])
-seed_button = Button(button_ax, 'New Seed')
+    # One colour per possible component key, so the cache never grows
+    palette = np.array([(random.random(), random.random(), random.random()) for _ in range(num_vertices)])
 
+    # Every edge is drawn once and closed edges are left transparent
+    xy = positions * spacing
+    lc_all = LineCollection(xy[edges], colors=(0, 0, 0, 0), linewidths=1)
+    ax.add_collection(lc_all)
+    vertex_dots = ax.scatter(xy[:, 0], xy[:, 1], s=64, zorder=3)
 
-def update(val):
-    global seed
+    recolor(initial_p)
 
-    p = slider.val
-    selected_edges = percolate(edges, p, seed)
-    components = components_BFS(num_vertices, selected_edges)
-
-    # Merge & update if connected
-    new_component_colors = {}
-    for component in components:
-        component_tuple = tuple(sorted(component))
-        if component_tuple not in component_colors:
-            component_colors[component_tuple] = (random.random(), random.random(), random.random())
-        new_component_colors[component_tuple] = component_colors[component_tuple]
-
-
-    colored_lines = get_colored_bond_lines(positions, edges, selected_edges, components, new_component_colors)
-    lc_all.set_segments([line for line, color in colored_lines])
-    lc_all.set_colors([color for line, color in colored_lines])
-
-    # Update colors
-    for i, position in enumerate(positions):
-        vertex_color = None
-        for comp in components:
-            if i in comp:
-                vertex_color = new_component_colors[tuple(sorted(comp))]
-                break
-        ax.plot(position[0] * spacing, position[1] * spacing, 'o', markersize=8, color=vertex_color)
+    # Sidebar
+    slider_ax = fig.add_axes([0.83, 0.45, 0.03, 0.4])
+    slider = Slider(slider_ax, 'p', 0.0, 0.15, valinit=initial_p, orientation='vertical')
+    button_ax = fig.add_axes([0.78, 0.2, 0.15, 0.05])
+    seed_button = Button(button_ax, 'New Seed')
 
-    title.set_text(f"Bond Percolation (n = {num_vertices}, p = {p:.2f}, seed = {seed})")
-    fig.canvas.draw_idle()
+    slider.on_changed(update)
+    seed_button.on_clicked(change_seed)
+    return fig
 
 
-def change_seed(event):
-    global seed
-    seed += 1
-    update(None)
+def main():
+    build_figure()
+    plt.show()
 
-slider.on_changed(update)
-seed_button.on_clicked(change_seed)
 
-plt.show()
+if __name__ == "__main__":
+    main()
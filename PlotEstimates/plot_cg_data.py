@@ -2,28 +2,33 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+from percolation.store import read_results
+
 
 plt.figure(figsize=(8, 5))
 
-df = pd.read_csv("cg_50_data.csv")
-p_values = df["p"].values
-mean_sizes = df["largest_components"].values
-plt.plot(p_values, mean_sizes, color='blue', label=r"$K_{50}$")
+df = read_results("cg_50_data")
+if df is not None:
+    p_values = df["p"].values
+    mean_sizes = df["largest_components"].values
+    plt.plot(p_values, mean_sizes, color='blue', label=r"$K_{50}$")
 plt.axvline(0.02, linestyle='--', color='darkblue', label=r"$p_c \approx 0.02$")
 
 
 
-df = pd.read_csv("cg_100_data.csv")
-p_values = df["p"].values
-mean_sizes = df["largest_components"].values
-plt.plot(p_values, mean_sizes,color='orange', label=r"$K_{100}$")
+df = read_results("cg_100_data")
+if df is not None:
+    p_values = df["p"].values
+    mean_sizes = df["largest_components"].values
+    plt.plot(p_values, mean_sizes,color='orange', label=r"$K_{100}$")
 plt.axvline(0.01, linestyle='--', color='darkorange', label=r"$p_c \approx 0.01$")
 
 
-df = pd.read_csv("cg_150_data.csv")
-p_values = df["p"].values
-mean_sizes = df["largest_components"].values
-plt.plot(p_values, mean_sizes,  color='red', label=r"$K_{150}$")
+df = read_results("cg_150_data")
+if df is not None:
+    p_values = df["p"].values
+    mean_sizes = df["largest_components"].values
+    plt.plot(p_values, mean_sizes,  color='red', label=r"$K_{150}$")
 plt.axvline(0.0066, linestyle='--', color='darkred', label=r"$p_c \approx 0.00667$")
 
 plt.title("Largest Connected Component vs p")
@@ -2,28 +2,33 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+from percolation.store import read_results
+
 
 plt.figure(figsize=(8, 5))
 
-df = pd.read_csv("cube_lattice_data.csv")
-p_values = df["p"].values
-mean_sizes = df["mean_cluster_size"].values
-plt.plot(p_values, mean_sizes, color='blue', label="Cube Lattice")
+df = read_results("cube_lattice_data")
+if df is not None:
+    p_values = df["p"].values
+    mean_sizes = df["mean_cluster_size"].values
+    plt.plot(p_values, mean_sizes, color='blue', label="Cube Lattice")
 plt.axvline(0.2488, linestyle='--', color='darkblue', label=r"$p_c \approx 0.2488$")
 
 
 
-df = pd.read_csv("square_lattice_data.csv")
-p_values = df["p"].values
-mean_sizes = df["mean_cluster_size"].values
-plt.plot(p_values, mean_sizes,color='orange', label="Square Lattice")
+df = read_results("square_lattice_data")
+if df is not None:
+    p_values = df["p"].values
+    mean_sizes = df["mean_cluster_size"].values
+    plt.plot(p_values, mean_sizes,color='orange', label="Square Lattice")
 plt.axvline(0.5, linestyle='--', color='darkorange', label=r"$p_c = 0.5$")
 
 
-df = pd.read_csv("triangle_lattice_data.csv")
-p_values = df["p"].values
-mean_sizes = df["mean_cluster_size"].values
-plt.plot(p_values, mean_sizes,  color='red', label="Triangle Lattice")
+df = read_results("triangle_lattice_data")
+if df is not None:
+    p_values = df["p"].values
+    mean_sizes = df["mean_cluster_size"].values
+    plt.plot(p_values, mean_sizes,  color='red', label="Triangle Lattice")
 plt.axvline(np.sin(np.pi/ 18) * 2, linestyle='--', color='darkred', label=r"$p_c = 2\sin(\frac{pi}{18})$")
 
 plt.title("Mean Cluster Containing Origin vs p")
@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import platform
+import runpy
+import subprocess
+import time
+import tracemalloc
+import types
+
+import numpy as np
+
+from percolation.batched import batch_trials
+from percolation.bitpacked import generate_packed, packed_cluster_stats
+from percolation.lattice import center_site
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+
+
+def load_script(name):
+    # The GenerateData scripts are not a package, so they are run by path
+    # (their __main__ blocks stay inactive) and used as namespaces
+    return types.SimpleNamespace(**runpy.run_path(os.path.join(ROOT, "GenerateData", name + ".py")))
+
+
+cube_sim = load_script("cube_sim")
+triangle_sim = load_script("triangle_sim")
+square_sim = load_script("square_sim")
+cg_sim = load_script("cg_sim")
+
+
+# Each benchmark maps a size to (callable, trials per call). The callable is
+# timed after setup, so only the stage named by the benchmark is measured.
+
+def bench_generate_cube(L):
+    return lambda: cube_sim.generate_cube(L, 0.25, seed=0), 1
+
+
+def bench_generate_triangle(L):
+    rng = np.random.default_rng(0)
+    return lambda: triangle_sim.generate_triangle(L, 0.35, rng), 1
+
+
+def bench_build_adjacency(L):
+    bonds = cube_sim.generate_cube(L, 0.25, seed=0)
+    return lambda: cube_sim.build_adjacency(L, *bonds), 1
+
+
+def bench_cluster_size_from_center(L):
+    graph = cube_sim.build_adjacency(L, *cube_sim.generate_cube(L, 0.25, seed=0))
+    return lambda: cube_sim.cluster_size_from_center(L, graph), 1
+
+
+def bench_batched_cube(L):
+    # Same per-trial work as cluster_size_from_center, 100 trials per call
+    rng = np.random.default_rng(0)
+    return lambda: batch_trials(L, 3, 0.25, rng, 100), 100
+
+
+def bench_packed_cube(L):
+    # Slab-wise generation and labeling on 1-bit bonds
+    def run():
+        packed = generate_packed(L, 3, 0.25, np.random.default_rng(0))
+        packed_cluster_stats(packed, L, center_site(L, 3))
+    return run, 1
+
+
+def bench_square_sweep(L):
+    return lambda: square_sim.simulate(L, np.linspace(0.1, 0.9, 30), 10), 10
+
+
+def bench_triangle_sweep(L):
+    return lambda: triangle_sim.simulate(L, np.linspace(0.1, 1.0, 30), 10), 10
+
+
+def bench_cube_sweep(L):
+    return lambda: cube_sim.simulate(L, np.linspace(0.1, 0.4, 30), 10), 10
+
+
+def bench_estimate_complete(n):
+    return lambda: cg_sim.estimate_complete(n, np.linspace(0, 0.15, 1000), 10), 10
+
+
+def viewer_bench(view, L):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.close("all")
+    viewer = runpy.run_path(os.path.join(ROOT, "Interactive", "InteractiveGraphs.py"))
+    g = viewer["draw_all"].__globals__
+    g["L_3d" if view == "Cube" else "L_2d"] = L
+    g["build_figure"]()
+    g["view_radio"].set_active([label.get_text() for label in g["view_radio"].labels].index(view))
+    p_values = iter(np.tile(np.linspace(0.2, 0.8, 7), 1000))
+
+    def move_slider():
+        g["slider"].set_val(next(p_values))
+        g["fig"].canvas.draw()
+    return move_slider, 1
+
+
+def bench_draw_all_square(L):
+    return viewer_bench("Square", L)
+
+
+def bench_draw_all_cube(L):
+    return viewer_bench("Cube", L)
+
+
+BENCHMARKS = {
+    "generate_cube": (bench_generate_cube, [10, 35, 100], [10, 35]),
+    "generate_triangle": (bench_generate_triangle, [50, 200, 1000], [50, 200]),
+    "build_adjacency": (bench_build_adjacency, [10, 35, 100], [10, 35]),
+    "cluster_size_from_center": (bench_cluster_size_from_center, [10, 35, 100], [10, 35]),
+    "batched_cube": (bench_batched_cube, [10, 35], [10]),
+    "packed_cube": (bench_packed_cube, [10, 35, 100, 256], [10, 35]),
+    "square_sweep": (bench_square_sweep, [50, 200], [50]),
+    "triangle_sweep": (bench_triangle_sweep, [50, 200], [50]),
+    "cube_sweep": (bench_cube_sweep, [10, 35], [10]),
+    "estimate_complete": (bench_estimate_complete, [50, 150, 1000], [50, 150]),
+    "draw_all_square": (bench_draw_all_square, [50, 200, 500], [50]),
+    "draw_all_cube": (bench_draw_all_cube, [10, 30], [10]),
+}
+
+
+def measure(func, min_time=0.5, max_repeats=20):
+    times = []
+    while len(times) < max_repeats and (len(times) < 3 or sum(times) < min_time):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return float(np.median(times)), float(min(times)), peak
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def previous_results(path):
+    # Latest stored median per (benchmark, size), to flag regressions
+    latest = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                row = json.loads(line)
+                latest[(row["name"], row["size"])] = row
+    return latest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the percolation pipeline stages")
+    parser.add_argument("--quick", action="store_true", help="only the small sizes")
+    parser.add_argument("--filter", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("--results", default=RESULTS, help="jsonl file to append results to")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    previous = previous_results(args.results)
+    run = {"commit": git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+           "machine": platform.node(), "python": platform.python_version()}
+    rows = []
+    print(f"{'benchmark':<26}{'size':>6}{'median s':>12}{'trials/s':>12}{'peak MB':>10}{'vs last':>9}")
+    for name, (setup, sizes, quick_sizes) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        for size in (quick_sizes if args.quick else sizes):
+            func, trials = setup(size)
+            median, best, peak = measure(func)
+            row = dict(run, name=name, size=size, median=median, best=best,
+                       trials_per_sec=trials / median, peak_bytes=peak)
+            rows.append(row)
+            last = previous.get((name, size))
+            change = f"{median / last['median']:.2f}x" if last else "-"
+            print(f"{name:<26}{size:>6}{median:>12.4f}{trials / median:>12.1f}{peak / 2 ** 20:>10.1f}{change:>9}")
+
+    if not args.no_save:
+        with open(args.results, "a") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# Bond percolation library shared by the GenerateData scripts, the
+# Interactive viewers, the benchmarks and the command line. The lattice,
+# sampling, labeling and observable helpers below are cheap to import;
+# sweep-level entry points that pull in pandas and tqdm are loaded on first
+# access.
+
+from percolation.backend import BACKENDS, set_backend, use_numba
+from percolation.lattice import (
+    center_site, lattice_faces, square_edges, cube_edges, hypercubic_edges, triangle_edges, honeycomb_edges,
+    complete_edges, generate_square, generate_cube, generate_triangle, generate_honeycomb, generate_hypercubic,
+    full_hypercubic, full_triangle, full_honeycomb, square_bond_pairs, cube_bond_pairs, hypercubic_bond_pairs,
+    triangle_bond_pairs, bonds_to_csr,
+)
+from percolation.labeling import label_clusters, label_csr, seeded_mask, cluster_stats, log_binned, measure
+from percolation.newman_ziff import newman_ziff, canonical
+from percolation.timeline import build_timeline, timeline_labels
+from percolation.batched import batch_trials
+from percolation.stats import moments, push, merge, summary
+
+LAZY = {
+    "sweep": "percolation.runner",
+    "to_frame": "percolation.runner",
+    "load_results": "percolation.store",
+    "adaptive_sweep": "percolation.adaptive",
+    "finite_size_scaling": "percolation.scaling",
+}
+
+
+def __getattr__(name):
+    if name in LAZY:
+        import importlib
+        return getattr(importlib.import_module(LAZY[name]), name)
+    raise AttributeError(f"module 'percolation' has no attribute {name!r}")
@@ -0,0 +1,95 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+from percolation.runner import lattice_graph, trial_curves
+from percolation.newman_ziff import canonical
+
+
+# Adaptive p_c search. Each trial block keeps its mean microcanonical
+# largest-cluster curve, so refining the p grid never needs new trials:
+# every block is simply re-convolved on the finer grid. Trials are added a
+# round of blocks at a time until the spread of the per-block p_c
+# estimates gives the requested confidence interval.
+
+def micro_block(lattice, L, p_max, num_trials, seed, periodic=False):
+    graph = lattice_graph(lattice, L, periodic)
+    rng = np.random.default_rng(seed)
+    total = 0
+    for _ in range(num_trials):
+        curves, M = trial_curves(lattice, graph, p_max, rng)
+        total = total + curves["largest"]
+    return total / (num_trials * graph[0]), M
+
+
+# Points of the internal grid used by steepest_p. Each zoom keeps 4 steps
+# around the steepest point, so the step shrinks by (ZOOM_POINTS - 1) / 4
+# per pass whatever grid the caller asked for.
+ZOOM_POINTS = 21
+
+
+def steepest_p(curve, M, lo, hi, tol=1e-5):
+    # Locate the maximum slope of P(p) by repeatedly zooming the grid onto
+    # the steepest interval.
+    while True:
+        p_values = np.linspace(lo, hi, ZOOM_POINTS)
+        slope = np.gradient(canonical(curve, p_values, M), p_values)
+        i = int(np.argmax(slope))
+        step = p_values[1] - p_values[0]
+        if step < tol:
+            return p_values[i]
+        lo, hi = max(0.0, p_values[i] - 2 * step), min(1.0, p_values[i] + 2 * step)
+
+
+def confidence(estimates, z=1.96):
+    estimates = np.asarray(estimates)
+    if len(estimates) < 2:
+        return estimates.mean(), np.inf
+    return estimates.mean(), z * estimates.std(ddof=1) / np.sqrt(len(estimates))
+
+
+# Blocks per round. Fixed rather than tied to the worker count, so the
+# spawned seeds and the round at which the search stops are the same for
+# any pool size.
+ROUND_BLOCKS = 4
+
+
+def adaptive_sweep(lattice, L, p_range, target, max_trials, workers=1, block_size=10, seed=None,
+                   periodic=False, num_points=30):
+    if max_trials <= 0:
+        raise ValueError(f"max_trials must be positive, got {max_trials}")
+    lo, hi = p_range
+    seeds = np.random.SeedSequence(seed)
+    pooled = 0
+    estimates = []
+    trials = 0
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        while trials < max_trials:
+            # The last round is cut short so that trials never exceed the cap
+            left = max_trials - trials
+            sizes = [min(block_size, left - k * block_size) for k in range(ROUND_BLOCKS) if left > k * block_size]
+            tasks = [(lattice, L, hi, n, s, periodic) for n, s in zip(sizes, seeds.spawn(len(sizes)))]
+            if pool is None:
+                results = [micro_block(*task) for task in tasks]
+            else:
+                results = list(pool.map(micro_block, *zip(*tasks)))
+            trials += sum(sizes)
+            pooled = pooled + sum(n * curve for n, (curve, _) in zip(sizes, results))
+            estimates.extend(steepest_p(curve, M, lo, hi) for curve, M in results)
+            p_c, half_width = confidence(estimates)
+            if half_width < target:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Report the pooled curve on the coarse grid plus a dense grid over the
+    # critical window, where the estimate says the curve actually changes.
+    M = results[0][1]
+    pooled = pooled / trials
+    width = max(4 * half_width, (hi - lo) / num_points) if np.isfinite(half_width) else hi - lo
+    p_values = np.union1d(np.linspace(lo, hi, num_points),
+                          np.linspace(max(lo, p_c - width), min(hi, p_c + width), num_points))
+    df = pd.DataFrame({"p": p_values, "largest_components": canonical(pooled, p_values, M)})
+    return {"p_c": p_c, "half_width": half_width, "trials": trials, "estimates": np.array(estimates), "curve": df}
@@ -0,0 +1,27 @@
+import importlib.util
+import os
+
+
+# Backend switch for the hot loops. "numba" runs the @njit kernels in
+# percolation.kernels, "python" keeps the pure Python / NumPy code. numba is
+# only imported once a kernel is first used, so importing the package stays
+# cheap. The choice is read from PERCOLATION_BACKEND, so worker processes
+# follow it.
+
+BACKENDS = ("numba", "python")
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+backend = os.environ.get("PERCOLATION_BACKEND", "numba" if HAVE_NUMBA else "python")
+
+
+def set_backend(name):
+    global backend
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}, expected one of {BACKENDS}")
+    if name == "numba" and not HAVE_NUMBA:
+        raise ValueError("the numba backend needs numba installed")
+    backend = name
+    os.environ["PERCOLATION_BACKEND"] = name
+
+
+def use_numba():
+    return backend == "numba" and HAVE_NUMBA
@@ -0,0 +1,84 @@
+import numpy as np
+
+from percolation import backend
+from percolation.lattice import bond_shape, center_site, lattice_faces, full_hypercubic, hypercubic_bond_pairs
+from percolation.labeling import label_clusters
+
+
+# Many small hypercubic trials at once. The bond masks of all trials come
+# from one RNG call per axis as a (trials, ...) stack, and the trials are
+# labeled together as one block-diagonal graph (trial t owns the sites
+# t * L^d ... (t + 1) * L^d - 1), so per-trial Python overhead is paid once.
+# With the numba backend the stack is instead fed straight to a batched
+# union-find kernel that reads cluster sizes off the roots.
+
+def generate_batch(L, d, p, rng, trials, periodic=False):
+    return tuple(rng.random((trials,) + bond_shape(L, d, a, periodic)) < p for a in range(d))
+
+
+def batch_bond_pairs(bonds, L, periodic=False):
+    trials, d = bonds[0].shape[0], len(bonds)
+    idx = np.arange(trials * L ** d, dtype=np.int64).reshape((trials,) + (L,) * d)
+    pairs = []
+    for a, mask in enumerate(bonds, 1):
+        src = idx
+        dst = np.roll(idx, -1, axis=a)
+        if not periodic:
+            src = np.delete(src, -1, axis=a)
+            dst = np.delete(dst, -1, axis=a)
+        pairs.append(np.stack([src[mask], dst[mask]], axis=1))
+    return np.concatenate(pairs)
+
+
+def batch_cluster_stats(labels, trials, origin=None, faces=None):
+    # Per-trial largest and second largest cluster, origin cluster, and
+    # crossing / percolation strength between faces = (start, end), each as
+    # an array over trials.
+    num_sites = len(labels) // trials
+    sizes = np.bincount(labels)
+    trial = np.empty(len(sizes), dtype=np.int64)
+    trial[labels] = np.arange(len(labels)) // num_sites
+
+    # Sort clusters by (trial, size): the last two of each trial are its
+    # largest and second largest
+    order = np.lexsort((sizes, trial))
+    last = np.searchsorted(trial[order], np.arange(trials), side="right") - 1
+    first = np.searchsorted(trial[order], np.arange(trials), side="left")
+    stats = {"largest": sizes[order[last]]}
+    stats["second"] = np.where(last > first, sizes[order[np.maximum(last - 1, 0)]], 0)
+
+    offsets = np.arange(trials) * num_sites
+    if origin is not None:
+        stats["origin"] = sizes[labels[offsets + origin]]
+    if faces is not None:
+        start = np.zeros(len(sizes), dtype=bool)
+        end = np.zeros(len(sizes), dtype=bool)
+        start[labels[(offsets[:, None] + faces[0]).ravel()]] = True
+        end[labels[(offsets[:, None] + faces[1]).ravel()]] = True
+        spanning = start & end
+        stats["spanning"] = np.bincount(trial[spanning], minlength=trials) > 0
+        stats["strength"] = np.bincount(trial, weights=sizes * spanning, minlength=trials) / num_sites
+    return stats
+
+
+def batch_trials(L, d, p, rng, trials, periodic=False):
+    # Observables of `trials` independent realizations at one p, with the
+    # origin at the centre and crossing along the last axis as in the runner
+    bonds = generate_batch(L, d, p, rng, trials, periodic)
+    faces = None if periodic else lattice_faces(L, d)[-1]
+    if backend.use_numba():
+        from percolation import kernels
+        # Bond k of a flattened trial joins pairs[k], matching the C order
+        # of the masks
+        pairs = hypercubic_bond_pairs(full_hypercubic(L, d, periodic), periodic)
+        masks = np.concatenate([b.reshape(trials, -1) for b in bonds], axis=1)
+        start, end = (np.zeros(0, dtype=np.int64),) * 2 if faces is None else faces
+        largest, second, origin, spanning, strength = kernels.batch_kernel(
+            L ** d, pairs[:, 0], pairs[:, 1], masks, center_site(L, d), start, end)
+        stats = {"largest": largest, "second": second, "origin": origin}
+        if faces is not None:
+            stats["spanning"] = spanning
+            stats["strength"] = strength
+        return stats
+    labels = label_clusters(trials * L ** d, batch_bond_pairs(bonds, L, periodic))
+    return batch_cluster_stats(labels, trials, center_site(L, d), faces)
@@ -0,0 +1,120 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from percolation.lattice import bond_shape, hypercubic_bond_pairs
+from percolation.labeling import label_clusters
+
+
+# Bit-packed bonds for large open hypercubic lattices: one uint8 array per
+# axis holding bond_shape(L, d, axis) with the last axis packed 8 bonds to a
+# byte, i.e. 1 bit per bond instead of a bool byte plus a float64 random.
+# Generation and labeling both walk slabs along axis 0, so only O(L^(d-1))
+# unpacked bonds or labels exist at any time.
+
+def generate_packed(L, d, p, rng):
+    # Slabs are drawn in the same C order as one big rng.random call, so the
+    # bonds match generate_hypercubic(L, d, p, rng) for the same rng state.
+    packed = []
+    for axis in range(d):
+        shape = bond_shape(L, d, axis)
+        bits = np.empty(shape[:-1] + (-(-shape[-1] // 8),), dtype=np.uint8)
+        for i in range(shape[0]):
+            bits[i] = np.packbits(rng.random(shape[1:]) < p, axis=-1)
+        packed.append(bits)
+    return packed
+
+
+def pack_bonds(bonds):
+    return [np.packbits(mask, axis=-1) for mask in bonds]
+
+
+def unpack_bonds(packed, L):
+    d = len(packed)
+    return tuple(unpack_slab(packed, L, axis, slice(None)) for axis in range(d))
+
+
+def unpack_slab(packed, L, axis, i):
+    length = bond_shape(L, len(packed), axis)[-1]
+    return np.unpackbits(packed[axis][i], axis=-1, count=length).astype(bool)
+
+
+def bond_open(packed, axis, coords):
+    # Is the bond from coords to coords + 1 along axis open?
+    byte = packed[axis][tuple(coords[:-1]) + (coords[-1] >> 3,)]
+    return bool((byte >> (7 - (coords[-1] & 7))) & 1)
+
+
+def packed_neighbors(packed, L, site):
+    d = len(packed)
+    coords = np.unravel_index(site, (L,) * d)
+    nbrs = []
+    for axis in range(d):
+        c = list(coords)
+        if c[axis] < L - 1 and bond_open(packed, axis, c):
+            nbrs.append(site + L ** (d - 1 - axis))
+        c[axis] -= 1
+        if c[axis] >= 0 and bond_open(packed, axis, c):
+            nbrs.append(site - L ** (d - 1 - axis))
+    return np.array(sorted(nbrs), dtype=np.int64)
+
+
+def slab_labels(packed, L, i):
+    # Clusters of slab i using only the bonds inside it
+    d = len(packed)
+    masks = [unpack_slab(packed, L, axis, i) for axis in range(1, d)]
+    return label_clusters(L ** (d - 1), hypercubic_bond_pairs(masks))
+
+
+def packed_cluster_stats(packed, L, origin=None):
+    # Hoshen-Kopelman over slabs: clusters still touching the current slab
+    # stay alive with their size and flags (1 = touches slab 0, 2 = holds
+    # origin); those that do not reach the next slab are finished. Returns
+    # the largest cluster, the origin cluster, the cluster-size histogram as
+    # (sizes, counts) and whether a cluster spans from slab 0 to slab L - 1.
+    d = len(packed)
+    area = L ** (d - 1)
+    finished = {}
+    largest = 0
+    origin_size = None
+
+    def finish(sizes, flags):
+        nonlocal largest, origin_size
+        if len(sizes) == 0:
+            return
+        largest = max(largest, int(sizes.max()))
+        if np.any(flags & 2):
+            origin_size = int(sizes[np.flatnonzero(flags & 2)[0]])
+        for size, count in zip(*np.unique(sizes, return_counts=True)):
+            finished[int(size)] = finished.get(int(size), 0) + int(count)
+
+    labels = slab_labels(packed, L, 0)
+    sizes = np.bincount(labels)
+    flags = np.ones(len(sizes), dtype=np.int8)
+    for i in range(1, L + 1):
+        if origin is not None and origin // area == i - 1:
+            flags[labels[origin % area]] |= 2
+        if i == L:
+            break
+        new = slab_labels(packed, L, i)
+        new_sizes = np.bincount(new)
+        n_old = len(sizes)
+        open_up = unpack_slab(packed, L, 0, i - 1).ravel()
+        graph = coo_matrix((np.ones(open_up.sum(), dtype=np.int8), (labels[open_up], n_old + new[open_up])),
+                           shape=(n_old + len(new_sizes),) * 2)
+        comp = connected_components(graph, directed=False)[1]
+        merged_sizes = np.bincount(comp, weights=np.concatenate([sizes, new_sizes])).astype(np.int64)
+        merged_flags = np.zeros(len(merged_sizes), dtype=np.int8)
+        np.bitwise_or.at(merged_flags, comp[:n_old], flags)
+        alive, labels = np.unique(comp[n_old + new], return_inverse=True)
+        done = np.setdiff1d(comp[:n_old], alive)
+        finish(merged_sizes[done], merged_flags[done])
+        sizes, flags = merged_sizes[alive], merged_flags[alive]
+
+    spanning = bool(np.any(flags & 1))
+    finish(sizes, flags)
+    histogram = np.array(sorted(finished.items()), dtype=np.int64).reshape(-1, 2)
+    stats = {"largest": largest, "sizes": histogram[:, 0], "counts": histogram[:, 1], "spanning": spanning}
+    if origin is not None:
+        stats["origin"] = origin_size
+    return stats
@@ -0,0 +1,154 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from percolation import backend
+from percolation.runner import LATTICES, sweep, to_frame
+from percolation.adaptive import adaptive_sweep, confidence
+from percolation.invasion import invasion_trials
+from percolation.realizations import save_realizations, load_realizations, evaluate_realizations
+from percolation.scaling import ladder_sweeps, finite_size_scaling
+
+
+def parse_p(text):
+    # "start:stop:num" for a linspace grid, otherwise a comma separated list
+    if ":" in text:
+        start, stop, num = text.split(":")
+        return np.linspace(float(start), float(stop), int(num))
+    return np.array([float(p) for p in text.split(",")])
+
+
+def plot_frame(df, column, label, target):
+    import matplotlib
+    if target != "show":
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 5))
+    plt.plot(df["p"], df[column], color='blue', label=label)
+    plt.xlabel("Bond Probability p")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    if target == "show":
+        plt.show()
+    else:
+        plt.savefig(target)
+
+
+def run_sweep(args):
+    p_values = parse_p(args.p)
+    if args.realizations:
+        save_realizations(args.realizations, args.lattice, args.L, args.trials, seed=args.seed, periodic=args.periodic)
+        stats = evaluate_realizations(args.realizations, args.lattice, args.L, p_values, periodic=args.periodic)
+    else:
+        stats = sweep(args.lattice, args.L, p_values, args.trials, workers=args.workers, block_size=args.block_size,
+                      seed=args.seed, periodic=args.periodic, store=args.store, target=args.target_stderr,
+                      target_observable=args.target_observable)
+    df = to_frame(p_values, stats)
+    df.to_csv(args.out, index=False)
+    if args.plot:
+        column = "largest_components" if args.lattice == "complete" else "mean_cluster_size"
+        plot_frame(df, column, f"{args.lattice} (L = {args.L})", args.plot)
+
+
+def run_adaptive(args):
+    p_values = parse_p(args.p)
+    result = adaptive_sweep(args.lattice, args.L, (p_values[0], p_values[-1]), args.target, args.trials,
+                            workers=args.workers, block_size=args.block_size, seed=args.seed,
+                            periodic=args.periodic, num_points=len(p_values))
+    result["curve"].to_csv(args.out, index=False)
+    print(f"p_c = {result['p_c']:.5f} +- {result['half_width']:.5f} ({result['trials']} trials)")
+
+
+def run_fss(args):
+    p_values = parse_p(args.p)
+    paths = ladder_sweeps(args.lattice, args.L, p_values, args.trials, args.root, workers=args.workers,
+                          block_size=args.block_size, seed=args.seed, periodic=args.periodic)
+    result = finite_size_scaling(paths, args.observable, nu_guess=args.nu, num_bootstrap=args.bootstrap,
+                                 seed=args.seed)
+    result["estimates"].to_csv(args.out, index=False)
+    print(result["crossings"].to_string(index=False))
+    for row in result["estimates"].itertuples():
+        print(f"{row.method}: p_c = {row.p_c:.5f} [{row.p_c_lo:.5f}, {row.p_c_hi:.5f}], "
+              f"nu = {row.nu:.3f} [{row.nu_lo:.3f}, {row.nu_hi:.3f}]")
+
+
+def run_invade(args):
+    realizations = None
+    if args.realizations:
+        save_realizations(args.realizations, args.lattice, args.L, args.trials, seed=args.seed)
+        realizations = load_realizations(args.realizations)
+    estimates = invasion_trials(args.lattice, args.L, args.trials, seed=args.seed, start=args.start,
+                                realizations=realizations)
+    pd.DataFrame({"p_c": estimates}).to_csv(args.out, index=False)
+    p_c, half_width = confidence(estimates)
+    print(f"p_c = {p_c:.5f} +- {half_width:.5f} ({len(estimates)} invasions)")
+
+
+def add_sweep_arguments(parser, ladder=False):
+    parser.add_argument("--lattice", choices=LATTICES, required=True)
+    if ladder:
+        parser.add_argument("--L", type=int, nargs="+", required=True, help="linear sizes, smallest first")
+    else:
+        parser.add_argument("--L", type=int, required=True, help="linear size, or n for the complete graph")
+    parser.add_argument("--p", default="0:1:101", help="start:stop:num or a comma separated list")
+    parser.add_argument("--trials", type=int, default=30, help="number of trials (the cap for adaptive)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--block-size", type=int, default=10, help="trials per task")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--periodic", action="store_true", help="periodic boundaries (hypercubic lattices)")
+    parser.add_argument("--backend", choices=backend.BACKENDS, default=backend.backend,
+                        help="compiled numba kernels or the pure Python/NumPy fallback")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="percolation", description="Bond percolation simulations")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    s = commands.add_parser("sweep", help="Newman-Ziff sweep over p, written as a *_data.csv table")
+    add_sweep_arguments(s)
+    s.add_argument("--store", default=None, help="directory to stream blocks to and resume from")
+    s.add_argument("--target-stderr", type=float, default=None,
+                   help="stop adding trials once the standard error is below this at every p")
+    s.add_argument("--target-observable", choices=["largest", "origin"], default="largest")
+    s.add_argument("--realizations", default=None,
+                   help="directory of saved edge thresholds to evaluate every p on (created if missing)")
+    s.add_argument("--out", required=True, help="csv file to write")
+    s.add_argument("--plot", nargs="?", const="show", default=None,
+                   help="show the curve, or save it to the given image file")
+    s.set_defaults(func=run_sweep)
+
+    a = commands.add_parser("adaptive", help="add trials and refine p until p_c is known to --target")
+    add_sweep_arguments(a)
+    a.add_argument("--target", type=float, required=True, help="95%% confidence half-width on p_c")
+    a.add_argument("--out", required=True, help="csv file for the pooled curve")
+    a.set_defaults(func=run_adaptive, trials=10000)
+
+    f = commands.add_parser("fss", help="sweep a ladder of sizes and fit p_c and nu by finite-size scaling")
+    add_sweep_arguments(f, ladder=True)
+    f.add_argument("--root", default="fss", help="directory holding one resumable store per size")
+    f.add_argument("--observable", default="spanning",
+                   help="spanning, largest, origin, or a column such as largest_components_binder")
+    f.add_argument("--nu", type=float, default=1.0, help="starting guess for nu")
+    f.add_argument("--bootstrap", type=int, default=100, help="block resamples for the confidence intervals")
+    f.add_argument("--out", required=True, help="csv file for the p_c and nu estimates")
+    f.set_defaults(func=run_fss, trials=200)
+
+    i = commands.add_parser("invade", help="estimate p_c by invasion percolation, one growth per realization")
+    i.add_argument("--lattice", choices=[name for name in LATTICES if name != "complete"], required=True)
+    i.add_argument("--L", type=int, required=True)
+    i.add_argument("--trials", type=int, default=100, help="number of realizations")
+    i.add_argument("--seed", type=int, default=None)
+    i.add_argument("--start", choices=["left", "center"], default="left",
+                   help="invade from the first face to the opposite one, or from the centre to the boundary")
+    i.add_argument("--realizations", default=None, help="directory of saved edge thresholds to invade")
+    i.add_argument("--out", required=True, help="csv file for the per-realization estimates")
+    i.set_defaults(func=run_invade)
+
+    args = parser.parse_args(argv)
+    if "backend" in args:
+        backend.set_backend(args.backend)
+    args.func(args)
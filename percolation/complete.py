@@ -0,0 +1,70 @@
+import numpy as np
+
+from percolation.newman_ziff import newman_ziff, binomial_window
+
+
+# Edges of K_n are numbered k = i * (i - 1) / 2 + j for j < i, so any k in
+# [0, n(n-1)/2) maps back to a pair without ever listing all the edges.
+
+def num_edges(n):
+    return n * (n - 1) // 2
+
+
+def edge_pairs(k):
+    k = np.asarray(k, dtype=np.int64)
+    i = ((1 + np.sqrt(1 + 8 * k.astype(float))) // 2).astype(np.int64)
+    i -= i * (i - 1) // 2 > k
+    i += (i + 1) * i // 2 <= k
+    j = k - i * (i - 1) // 2
+    return np.stack([i, j], axis=1)
+
+
+def gnp_edges(n, p, rng):
+    # Geometric skip sampling: gaps between kept edges are Geometric(p), so
+    # G(n, p) costs O(m) draws instead of one coin flip per pair.
+    M = num_edges(n)
+    if p <= 0 or M == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    if p >= 1:
+        return edge_pairs(np.arange(M))
+    chunk = int(M * p + 5 * np.sqrt(M * p) + 16)
+    kept = []
+    last = -1
+    while last < M:
+        k = last + np.cumsum(rng.geometric(p, size=chunk))
+        last = k[-1]
+        kept.append(k[k < M])
+    return edge_pairs(np.concatenate(kept))
+
+
+def gnp_largest(n, p, rng):
+    from percolation.labeling import label_clusters
+
+    labels = label_clusters(n, gnp_edges(n, p, rng))
+    return np.bincount(labels).max() / n
+
+
+def random_edges(n, m, rng):
+    # First m edges of a uniformly random ordering of K_n's edges, drawn by
+    # rejecting repeats rather than permuting all n(n-1)/2 of them.
+    M = num_edges(n)
+    m = min(m, M)
+    if m > M // 2:
+        return edge_pairs(rng.permutation(M)[:m])
+    k = np.empty(0, dtype=np.int64)
+    while len(k) < m:
+        k = np.concatenate([k, rng.integers(0, M, size=m - len(k) + 16)])
+        _, first = np.unique(k, return_index=True)
+        k = k[np.sort(first)]
+    return edge_pairs(k[:m])
+
+
+def max_edges(n, p_max):
+    lo, w = binomial_window(num_edges(n), p_max)
+    return lo + len(w) - 1
+
+
+def complete_sweep(n, p_max, rng):
+    # Newman-Ziff over the random graph process, stopped once the binomial
+    # window for p_max is covered. Convolve with canonical(..., M=num_edges(n)).
+    return newman_ziff(n, random_edges(n, max_edges(n, p_max), rng), rng)
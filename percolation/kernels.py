@@ -0,0 +1,182 @@
+import numpy as np
+from numba import njit
+
+
+# Compiled union-find kernels, used when backend.use_numba() is true. Each
+# is compiled on first use and cached next to this file.
+
+jit = njit(cache=True)
+
+
+@jit
+def find(parent, i):
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:
+        parent[i], i = root, parent[i]
+    return root
+
+
+@jit
+def size_bin(s):
+    k = -1
+    while s > 0:
+        s >>= 1
+        k += 1
+    return k
+
+
+@jit
+def newman_ziff_kernel(num_sites, pairs, origin, flags, bins):
+    # Same sweep as newman_ziff.newman_ziff over pre-shuffled pairs; origin
+    # is -1 when unused and flags is empty when there are no faces. binned
+    # holds the per-bond changes of the log2 size-bin counts.
+    M = len(pairs)
+    parent = np.arange(num_sites)
+    size = np.ones(num_sites, dtype=np.int64)
+    count = np.zeros(num_sites + 1, dtype=np.int64)
+    count[1] = num_sites
+    largest = np.empty(M + 1)
+    second = np.empty(M + 1)
+    finite = np.empty(M + 1)
+    origin_size = np.empty(M + 1)
+    spanning = np.empty(M + 1)
+    strength = np.empty(M + 1)
+    binned = np.zeros((bins, M + 1), dtype=np.int32)
+    binned[0, 0] = num_sites
+    track = len(flags) > 0
+    spanning_mass = 0
+    if track:
+        for i in range(num_sites):
+            if flags[i] == 3:
+                spanning_mass += 1
+    big = 1
+    runner_up = 1 if num_sites > 1 else 0
+    sum_sq = num_sites
+    root0 = origin
+    largest[0] = 1
+    second[0] = runner_up
+    finite[0] = 1
+    origin_size[0] = 1
+    spanning[0] = spanning_mass > 0
+    strength[0] = spanning_mass
+    for n in range(M):
+        ra = find(parent, pairs[n, 0])
+        rb = find(parent, pairs[n, 1])
+        if ra != rb:
+            if size[ra] < size[rb]:
+                ra, rb = rb, ra
+            if track:
+                before = 0
+                if flags[ra] == 3:
+                    before += size[ra]
+                if flags[rb] == 3:
+                    before += size[rb]
+                flags[ra] |= flags[rb]
+                if flags[ra] == 3:
+                    spanning_mass += size[ra] + size[rb] - before
+            sa = size[ra]
+            sb = size[rb]
+            s = sa + sb
+            parent[rb] = ra
+            size[ra] = s
+            count[sa] -= 1
+            count[sb] -= 1
+            count[s] += 1
+            sum_sq += 2 * sa * sb
+            binned[size_bin(sa), n + 1] -= 1
+            binned[size_bin(sb), n + 1] -= 1
+            binned[size_bin(s), n + 1] += 1
+            if s >= big:
+                if sa == big:
+                    if sb == runner_up:
+                        while runner_up > 0 and count[runner_up] == 0:
+                            runner_up -= 1
+                else:
+                    runner_up = big
+                big = s
+            elif s > runner_up:
+                runner_up = s
+            if rb == root0:
+                root0 = ra
+        largest[n + 1] = big
+        second[n + 1] = runner_up
+        finite[n + 1] = (sum_sq - big * big) / (num_sites - big) if big < num_sites else 0
+        origin_size[n + 1] = size[root0] if origin >= 0 else 1
+        spanning[n + 1] = spanning_mass > 0
+        strength[n + 1] = spanning_mass
+    return largest, second, finite, origin_size, spanning, strength, binned
+
+
+@jit
+def timeline_kernel(num_sites, pairs, every):
+    # Union-find over pairs in order, with every site's root stored every
+    # `every` bonds (row 0 is the empty lattice)
+    parent = np.arange(num_sites)
+    size = np.ones(num_sites, dtype=np.int64)
+    snapshots = np.empty((len(pairs) // every + 1, num_sites), dtype=np.int32)
+    snapshots[0] = parent
+    for n in range(len(pairs)):
+        ra = find(parent, pairs[n, 0])
+        rb = find(parent, pairs[n, 1])
+        if ra != rb:
+            if size[ra] < size[rb]:
+                ra, rb = rb, ra
+            parent[rb] = ra
+            size[ra] += size[rb]
+        if (n + 1) % every == 0:
+            row = (n + 1) // every
+            for i in range(num_sites):
+                snapshots[row, i] = find(parent, i)
+    return snapshots
+
+
+@jit
+def batch_kernel(num_sites, src, dst, masks, origin, start, end):
+    # Union-find over many trials of one lattice: masks[t, k] opens bond
+    # (src[k], dst[k]) in trial t. Cluster sizes are read off the roots, so
+    # no labels are ever built. origin is -1 and start / end empty if unused.
+    trials = masks.shape[0]
+    parent = np.arange(num_sites)
+    size = np.ones(num_sites, dtype=np.int64)
+    flags = np.zeros(num_sites, dtype=np.int8)
+    largest = np.zeros(trials, dtype=np.int64)
+    second = np.zeros(trials, dtype=np.int64)
+    origin_size = np.zeros(trials, dtype=np.int64)
+    spanning = np.zeros(trials, dtype=np.bool_)
+    strength = np.zeros(trials)
+    for t in range(trials):
+        for i in range(num_sites):
+            parent[i] = i
+            size[i] = 1
+            flags[i] = 0
+        for k in range(len(src)):
+            if masks[t, k]:
+                ra = find(parent, src[k])
+                rb = find(parent, dst[k])
+                if ra != rb:
+                    if size[ra] < size[rb]:
+                        ra, rb = rb, ra
+                    parent[rb] = ra
+                    size[ra] += size[rb]
+        for i in range(num_sites):
+            if parent[i] == i:
+                if size[i] > largest[t]:
+                    second[t] = largest[t]
+                    largest[t] = size[i]
+                elif size[i] > second[t]:
+                    second[t] = size[i]
+        if origin >= 0:
+            origin_size[t] = size[find(parent, origin)]
+        for i in start:
+            flags[find(parent, i)] |= 1
+        for i in end:
+            flags[find(parent, i)] |= 2
+        mass = 0
+        for i in range(num_sites):
+            if parent[i] == i and flags[i] == 3:
+                mass += size[i]
+        spanning[t] = mass > 0
+        strength[t] = mass / num_sites
+    return largest, second, origin_size, spanning, strength
@@ -0,0 +1,58 @@
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+
+def label_clusters(num_sites, pairs):
+    data = np.ones(len(pairs), dtype=np.int8)
+    graph = coo_matrix((data, (pairs[:, 0], pairs[:, 1])), shape=(num_sites, num_sites))
+    return connected_components(graph, directed=False)[1]
+
+
+def label_csr(indptr, indices):
+    num_sites = len(indptr) - 1
+    graph = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(num_sites, num_sites))
+    return connected_components(graph, directed=False)[1]
+
+
+def seeded_mask(labels, seeds):
+    return np.isin(labels, labels[np.asarray(seeds)])
+
+
+def log_binned(sizes, num_sites):
+    # Clusters per site with size in [2^k, 2^(k + 1)). The bins depend only
+    # on num_sites, so histograms from separate trials or workers just add.
+    k = np.floor(np.log2(sizes[sizes > 0])).astype(np.int64)
+    return np.bincount(k, minlength=int(num_sites).bit_length()) / num_sites
+
+
+def cluster_stats(labels, origin=None, faces=()):
+    # Everything here comes from the one bincount of the labels
+    num_sites = len(labels)
+    sizes = np.bincount(labels)
+    ranked = np.partition(sizes, len(sizes) - 2) if len(sizes) > 1 else np.append(0, sizes)
+    big = ranked[-1]
+    stats = {
+        "largest": int(big),
+        "largest_fraction": big / num_sites,
+        "second": int(ranked[-2]),
+        # mean size of the cluster holding a site outside the giant
+        "finite": (np.sum(sizes ** 2) - big ** 2) / (num_sites - big) if big < num_sites else 0.0,
+        "histogram": np.bincount(sizes),
+        "log_histogram": log_binned(sizes, num_sites),
+    }
+    if origin is not None:
+        stats["origin"] = int(sizes[labels[origin]])
+    # Per (start, end) face pair: does any cluster touch both, and what
+    # fraction of sites lies in such spanning clusters?
+    spanning = [np.intersect1d(labels[a], labels[b]) for a, b in faces]
+    stats["spanning"] = np.array([s.size > 0 for s in spanning], dtype=bool)
+    stats["strength"] = np.array([sizes[s].sum() / len(labels) for s in spanning])
+    return stats
+
+
+def measure(num_sites, pairs, origin=None, faces=()):
+    labels = label_clusters(num_sites, pairs)
+    stats = cluster_stats(labels, origin, faces)
+    stats["labels"] = labels
+    return stats
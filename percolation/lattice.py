@@ -0,0 +1,158 @@
+import numpy as np
+
+
+# Sites are flat indices into an (L,) * d grid in C order, so the square site
+# (i, j) is i * L + j and the cube site (i, j, k) is (i * L + j) * L + k.
+
+def center_site(L, d):
+    return int(np.ravel_multi_index((L // 2,) * d, (L,) * d))
+
+
+def _pairs(a, b):
+    return np.stack([a.ravel(), b.ravel()], axis=1)
+
+
+def square_edges(L, periodic=False):
+    return hypercubic_edges(L, 2, periodic)
+
+
+def cube_edges(L, periodic=False):
+    return hypercubic_edges(L, 3, periodic)
+
+
+def hypercubic_edges(L, d, periodic=False):
+    return hypercubic_bond_pairs(full_hypercubic(L, d, periodic), periodic)
+
+
+def triangle_edges(L):
+    return triangle_bond_pairs(*full_triangle(L))
+
+
+def honeycomb_edges(L):
+    return square_bond_pairs(*full_honeycomb(L))
+
+
+def complete_edges(n):
+    i, j = np.triu_indices(n, 1)
+    return np.stack([i, j], axis=1)
+
+
+# Bond masks, one boolean array per bond direction. The triangular lattice
+# adds a diagonal mask whose direction alternates with row parity, and the
+# honeycomb is the brick-wall square lattice with every other rung removed.
+
+def generate_square(L, p, rng):
+    h_bonds = rng.random((L, L - 1)) < p
+    v_bonds = rng.random((L - 1, L)) < p
+    return h_bonds, v_bonds
+
+
+def generate_cube(L, p, rng):
+    x_bonds = rng.random((L, L, L - 1)) < p
+    y_bonds = rng.random((L, L - 1, L)) < p
+    z_bonds = rng.random((L - 1, L, L)) < p
+    return x_bonds, y_bonds, z_bonds
+
+
+def generate_triangle(L, p, rng):
+    h_bonds, v_bonds = generate_square(L, p, rng)
+    d_bonds = rng.random((L - 1, L - 1)) < p
+    return h_bonds, v_bonds, d_bonds
+
+
+def honeycomb_rungs(L):
+    i, j = np.indices((L - 1, L))
+    return (i + j) % 2 == 0
+
+
+def generate_honeycomb(L, p, rng):
+    h_bonds, v_bonds = generate_square(L, p, rng)
+    return h_bonds, v_bonds & honeycomb_rungs(L)
+
+
+def bond_shape(L, d, axis, periodic=False):
+    # Bond (..., x_axis, ...) joins x_axis to x_axis + 1; with periodic
+    # boundaries the last one wraps round to 0.
+    shape = [L] * d
+    if not periodic:
+        shape[axis] = L - 1
+    return tuple(shape)
+
+
+def generate_hypercubic(L, d, p, rng, periodic=False):
+    # One mask per axis, in axis order, so for d = 3 this is
+    # (z_bonds, y_bonds, x_bonds) in generate_cube's naming.
+    return tuple(rng.random(bond_shape(L, d, a, periodic)) < p for a in range(d))
+
+
+def full_hypercubic(L, d, periodic=False):
+    return tuple(np.ones(bond_shape(L, d, a, periodic), bool) for a in range(d))
+
+
+def full_triangle(L):
+    return np.ones((L, L - 1), bool), np.ones((L - 1, L), bool), np.ones((L - 1, L - 1), bool)
+
+
+def full_honeycomb(L):
+    return np.ones((L, L - 1), bool), honeycomb_rungs(L)
+
+
+# Open bonds as int32 site pairs, taken straight from the boolean bond masks
+
+def square_bond_pairs(h_bonds, v_bonds):
+    L = h_bonds.shape[0]
+    idx = np.arange(L * L, dtype=np.int32).reshape(L, L)
+    h = _pairs(idx[:, :-1][h_bonds], idx[:, 1:][h_bonds])
+    v = _pairs(idx[:-1, :][v_bonds], idx[1:, :][v_bonds])
+    return np.concatenate([h, v])
+
+
+def cube_bond_pairs(x_bonds, y_bonds, z_bonds):
+    L = x_bonds.shape[0]
+    idx = np.arange(L ** 3, dtype=np.int32).reshape(L, L, L)
+    x = _pairs(idx[:, :, :-1][x_bonds], idx[:, :, 1:][x_bonds])
+    y = _pairs(idx[:, :-1, :][y_bonds], idx[:, 1:, :][y_bonds])
+    z = _pairs(idx[:-1, :, :][z_bonds], idx[1:, :, :][z_bonds])
+    return np.concatenate([x, y, z])
+
+
+def hypercubic_bond_pairs(bonds, periodic=False):
+    d = len(bonds)
+    L = bonds[0].shape[0] + (not periodic)
+    idx = np.arange(L ** d, dtype=np.int32).reshape((L,) * d)
+    pairs = []
+    for a, mask in enumerate(bonds):
+        src = idx
+        dst = np.roll(idx, -1, axis=a)
+        if not periodic:
+            src = np.delete(src, -1, axis=a)
+            dst = np.delete(dst, -1, axis=a)
+        pairs.append(_pairs(src[mask], dst[mask]))
+    return np.concatenate(pairs)
+
+
+def triangle_bond_pairs(h_bonds, v_bonds, d_bonds):
+    L = h_bonds.shape[0]
+    idx = np.arange(L * L, dtype=np.int32).reshape(L, L)
+    # Odd rows are drawn shifted right by half a cell, so their diagonal runs
+    # down-right to (i + 1, j + 1); even rows run down-left to (i + 1, j - 1).
+    odd = (np.arange(L - 1) % 2 == 1)[:, None]
+    a = np.where(odd, idx[:-1, :-1], idx[:-1, 1:])
+    b = np.where(odd, idx[1:, 1:], idx[1:, :-1])
+    d = _pairs(a[d_bonds], b[d_bonds])
+    return np.concatenate([square_bond_pairs(h_bonds, v_bonds), d])
+
+
+def bonds_to_csr(num_sites, pairs):
+    src = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    dst = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(num_sites + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=num_sites), out=indptr[1:])
+    return indptr, dst[order].astype(np.int32)
+
+
+def lattice_faces(L, d):
+    # (first, last) face of sites along each axis, for spanning checks
+    idx = np.arange(L ** d).reshape((L,) * d)
+    return [(np.take(idx, 0, axis=a).ravel(), np.take(idx, -1, axis=a).ravel()) for a in range(d)]
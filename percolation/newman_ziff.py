@@ -0,0 +1,165 @@
+import numpy as np
+
+from percolation import backend
+
+
+def find(parent, i):
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:
+        parent[i], i = root, parent[i]
+    return root
+
+
+def newman_ziff(num_sites, edges, rng, origin=None, faces=None):
+    # Occupy bonds one at a time in random order and record the observables
+    # after every bond, i.e. as a function of the number of open bonds n.
+    # With faces = (start, end) site arrays each root also carries a bit per
+    # face it touches, which gives crossing and percolation strength for free.
+    # A count of clusters per size gives the second largest cluster, and the
+    # running sum of squared sizes the mean cluster size without the giant.
+    # Each merge moves at most 3 clusters between log2 size bins, so the
+    # log-binned n_s is kept as per-bond changes of the bin counts and summed
+    # up at the end; like the other curves its bins n_s_k convolve over p.
+    order = rng.permutation(len(edges))
+    bins = int(num_sites).bit_length()
+    if backend.use_numba():
+        from percolation import kernels
+        flags = np.zeros(num_sites if faces is not None else 0, dtype=np.int8)
+        if faces is not None:
+            flags[faces[0]] |= 1
+            flags[faces[1]] |= 2
+        largest, second, finite, origin_size, spanning, strength, binned = kernels.newman_ziff_kernel(
+            num_sites, edges[order], -1 if origin is None else origin, flags, bins)
+        curves = {"largest": largest, "second": second, "finite": finite}
+        curves.update(size_bins(binned, num_sites))
+        if origin is not None:
+            curves["origin"] = origin_size
+        if faces is not None:
+            curves["spanning"] = spanning
+            curves["strength"] = strength
+        return curves
+
+    parent = list(range(num_sites))
+    size = [1] * num_sites
+    count = [0] * (num_sites + 1)
+    count[1] = num_sites
+    largest = [1]
+    second = [int(num_sites > 1)]
+    finite = [1]
+    origin_size = [1]
+    big = 1
+    runner_up = second[0]
+    sum_sq = num_sites
+    root0 = origin
+    binned = np.zeros((bins, len(edges) + 1), dtype=np.int32)
+    binned[0, 0] = num_sites
+
+    if faces is not None:
+        flags = np.zeros(num_sites, dtype=np.int64)
+        flags[faces[0]] |= 1
+        flags[faces[1]] |= 2
+        flags = flags.tolist()
+        spanning_mass = sum(1 for f in flags if f == 3)
+        spanning = [int(spanning_mass > 0)]
+        strength = [spanning_mass]
+
+    for n, (a, b) in enumerate(edges[order].tolist(), 1):
+        ra = find(parent, a)
+        rb = find(parent, b)
+        if ra != rb:
+            if size[ra] < size[rb]:
+                ra, rb = rb, ra
+            if faces is not None:
+                before = (flags[ra] == 3) * size[ra] + (flags[rb] == 3) * size[rb]
+                flags[ra] |= flags[rb]
+                if flags[ra] == 3:
+                    spanning_mass += size[ra] + size[rb] - before
+            sa, sb = size[ra], size[rb]
+            s = sa + sb
+            parent[rb] = ra
+            size[ra] = s
+            count[sa] -= 1
+            count[sb] -= 1
+            count[s] += 1
+            sum_sq += 2 * sa * sb
+            binned[sa.bit_length() - 1, n] -= 1
+            binned[sb.bit_length() - 1, n] -= 1
+            binned[s.bit_length() - 1, n] += 1
+            if s >= big:
+                if sa == big:
+                    # The giant grew; if it swallowed the runner-up, step
+                    # down to the next size still present
+                    if sb == runner_up:
+                        while runner_up > 0 and count[runner_up] == 0:
+                            runner_up -= 1
+                else:
+                    runner_up = big
+                big = s
+            elif s > runner_up:
+                runner_up = s
+            if rb == root0:
+                root0 = ra
+        largest.append(big)
+        second.append(runner_up)
+        finite.append((sum_sq - big * big) / (num_sites - big) if big < num_sites else 0)
+        if origin is not None:
+            origin_size.append(size[root0])
+        if faces is not None:
+            spanning.append(int(spanning_mass > 0))
+            strength.append(spanning_mass)
+
+    curves = {
+        "largest": np.array(largest, dtype=float),
+        "second": np.array(second, dtype=float),
+        "finite": np.array(finite, dtype=float),
+    }
+    if origin is not None:
+        curves["origin"] = np.array(origin_size, dtype=float)
+    if faces is not None:
+        curves["spanning"] = np.array(spanning, dtype=float)
+        curves["strength"] = np.array(strength, dtype=float)
+    curves.update(size_bins(binned, num_sites))
+    return curves
+
+
+def size_bins(binned, num_sites):
+    # Per-bond changes of the clusters per log2 size bin -> n_s_k curves,
+    # clusters per site with size in [2^k, 2^(k + 1)) as in log_binned
+    counts = np.cumsum(binned, axis=1)
+    return {f"n_s_{k}": counts[k] / num_sites for k in range(len(counts))}
+
+
+def binomial_window(M, p, width=10.0):
+    # Binomial(M, p) weights restricted to mean +- width * sigma, built from the
+    # pmf ratio so it stays exact in log space for very large M.
+    if p <= 0:
+        return 0, np.ones(1)
+    if p >= 1:
+        return M, np.ones(1)
+    mean = M * p
+    sigma = np.sqrt(M * p * (1 - p))
+    lo = max(0, int(np.floor(mean - width * sigma)) - 1)
+    hi = min(M, int(np.ceil(mean + width * sigma)) + 1)
+    n = np.arange(lo, hi, dtype=float)
+    log_ratio = np.log((M - n) / (n + 1)) + np.log(p / (1 - p))
+    log_w = np.concatenate([[0.0], np.cumsum(log_ratio)])
+    w = np.exp(log_w - log_w.max())
+    return lo, w / w.sum()
+
+
+def binomial_windows(M, p_values):
+    return [binomial_window(M, p) for p in p_values]
+
+
+def canonical(values, p_values, M=None, windows=None):
+    # Convolve microcanonical curves Q_n (last axis) with the binomial
+    # distribution to get Q(p). M defaults to the full curve length; pass
+    # windows = binomial_windows(M, p_values) to reuse them across calls.
+    values = np.asarray(values, dtype=float)
+    if M is None:
+        M = values.shape[-1] - 1
+    if windows is None:
+        windows = binomial_windows(M, p_values)
+    return np.stack([values[..., lo:lo + len(w)] @ w for lo, w in windows], axis=-1)
@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+from tqdm import tqdm
+
+from percolation.labeling import label_clusters, cluster_stats
+from percolation.lattice import complete_edges
+from percolation.runner import lattice_graph
+from percolation.stats import moments, push, summary
+from percolation.store import open_store
+
+
+# Saved lattice realizations. Each realization is one uint16 threshold per
+# edge, and the edge is open at p when its threshold is below p * 2^16, so
+# a realization is evaluated at any p without regenerating it, and every p
+# sees the same configurations (coupled realizations). Thresholds for all
+# realizations live in one (num_realizations, num_edges) .npy file that is
+# read back memory-mapped, a row at a time.
+
+THRESHOLDS = "thresholds.npy"
+LEVELS = 1 << 16
+
+
+def realization_edges(lattice, L, periodic=False):
+    num_sites, edges, origin, faces = lattice_graph(lattice, L, periodic)
+    if lattice == "complete":
+        edges = complete_edges(L)
+    return num_sites, edges, origin, faces
+
+
+def save_realizations(path, lattice, L, num_realizations, seed=None, periodic=False):
+    # Reuses the store's config check, so an existing directory is only
+    # accepted for the same lattice, size and seed.
+    config = {"lattice": lattice, "L": L, "num_realizations": num_realizations, "periodic": periodic, "seed": seed}
+    config = open_store(path, config)
+    thresholds_path = os.path.join(path, THRESHOLDS)
+    if os.path.exists(thresholds_path):
+        return config
+    edges = realization_edges(lattice, L, periodic)[1]
+    partial = thresholds_path + ".part"
+    out = np.lib.format.open_memmap(partial, mode="w+", dtype=np.uint16, shape=(num_realizations, len(edges)))
+    for r, s in enumerate(np.random.SeedSequence(config["seed"]).spawn(num_realizations)):
+        out[r] = np.random.default_rng(s).integers(0, LEVELS, len(edges), dtype=np.uint16)
+    out.flush()
+    del out
+    os.replace(partial, thresholds_path)
+    return config
+
+
+def load_realizations(path):
+    return np.load(os.path.join(path, THRESHOLDS), mmap_mode="r")
+
+
+def open_level(p):
+    return int(round(p * LEVELS))
+
+
+def bonds_at(thresholds, p):
+    return thresholds < open_level(p)
+
+
+def evaluate_realizations(path, lattice, L, p_values, periodic=False):
+    # Observables at every p for every saved realization, as the usual
+    # {name: summary} so runner.to_frame can write it. Each labeling also
+    # gives the log-binned cluster-size histogram, one n_s_k column per bin
+    # of sizes [2^k, 2^(k + 1)).
+    num_sites, edges, origin, faces = realization_edges(lattice, L, periodic)
+    thresholds = load_realizations(path)
+    faces = [] if faces is None else [faces]
+    accs = {}
+    for r in tqdm(range(len(thresholds))):
+        row = np.asarray(thresholds[r])
+        values = {}
+        for k, p in enumerate(p_values):
+            stats = cluster_stats(label_clusters(num_sites, edges[bonds_at(row, p)]), origin, faces)
+            values.setdefault("largest", np.zeros(len(p_values)))[k] = stats["largest_fraction"]
+            values.setdefault("second", np.zeros(len(p_values)))[k] = stats["second"] / num_sites
+            values.setdefault("finite", np.zeros(len(p_values)))[k] = stats["finite"]
+            for b, n_s in enumerate(stats["log_histogram"]):
+                values.setdefault(f"n_s_{b}", np.zeros(len(p_values)))[k] = n_s
+            if origin is not None:
+                values.setdefault("origin", np.zeros(len(p_values)))[k] = stats["origin"]
+            if faces:
+                values.setdefault("spanning", np.zeros(len(p_values)))[k] = stats["spanning"][0]
+                values.setdefault("strength", np.zeros(len(p_values)))[k] = stats["strength"][0]
+        for name, x in values.items():
+            push(accs.setdefault(name, moments(len(p_values))), x)
+    return {name: summary(acc) for name, acc in accs.items()}
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from tqdm import tqdm
+
+from percolation.complete import complete_sweep, num_edges
+from percolation.lattice import center_site, lattice_faces, hypercubic_edges, triangle_edges, honeycomb_edges
+from percolation.newman_ziff import newman_ziff, canonical, binomial_windows
+from percolation.stats import moments, push, merge, summary
+from percolation.store import open_store, load_blocks, append_block
+
+
+HYPERCUBIC = {"square": 2, "cube": 3, "hypercubic4": 4, "hypercubic5": 5, "hypercubic6": 6}
+OFFSET = {"triangle": triangle_edges, "honeycomb": honeycomb_edges}
+LATTICES = [*HYPERCUBIC, *OFFSET, "complete"]
+
+# CSV column for each observable, matching PlotEstimates/*_data.csv
+COLUMNS = {
+    "origin": "mean_cluster_size",
+    "largest": "largest_components",
+    "second": "second_largest",
+    "finite": "mean_finite_cluster_size",
+    "spanning": "crossing_probability",
+    "strength": "percolation_strength",
+}
+# Observables reported as a fraction of all sites
+FRACTIONS = ("largest", "second", "strength")
+
+
+def lattice_graph(lattice, L, periodic=False):
+    # Crossing is measured between the first and last faces of the last
+    # axis: left to right in 2D and the viewer's front to back face in 3D.
+    if lattice == "complete":
+        return L, None, None, None
+    if lattice in HYPERCUBIC:
+        d = HYPERCUBIC[lattice]
+        faces = None if periodic else lattice_faces(L, d)[-1]
+        return L ** d, hypercubic_edges(L, d, periodic), center_site(L, d), faces
+    if periodic:
+        raise ValueError(f"periodic boundaries are not supported for the {lattice} lattice")
+    return L * L, OFFSET[lattice](L), center_site(L, 2), lattice_faces(L, 2)[-1]
+
+
+def trial_curves(lattice, graph, p_max, rng):
+    num_sites, edges, origin, faces = graph
+    if lattice == "complete":
+        return complete_sweep(num_sites, p_max, rng), num_edges(num_sites)
+    return newman_ziff(num_sites, edges, rng, origin, faces), len(edges)
+
+
+def run_block(lattice, L, p_values, num_trials, seed, periodic=False):
+    graph = lattice_graph(lattice, L, periodic)
+    num_sites = graph[0]
+    rng = np.random.default_rng(seed)
+    accs = {}
+    windows = None
+    for _ in range(num_trials):
+        curves, M = trial_curves(lattice, graph, p_values.max(), rng)
+        if windows is None:
+            # M is fixed by the lattice, so one set of windows serves every
+            # observable of every trial
+            windows = binomial_windows(M, p_values)
+        names = list(curves)
+        values = np.stack([curves[name] / num_sites if name in FRACTIONS else curves[name] for name in names])
+        powers = canonical(np.stack([values, values ** 2, values ** 4], axis=1), p_values, M, windows)
+        for name, power in zip(names, powers):
+            push(accs.setdefault(name, moments(len(p_values))), *power)
+    return accs
+
+
+def trial_blocks(num_trials, block_size, seed=None):
+    # Blocks and their seeds depend only on (num_trials, block_size, seed),
+    # never on the worker count, so any pool size gives identical results.
+    num_blocks = -(-num_trials // block_size)
+    seeds = np.random.SeedSequence(seed).spawn(num_blocks)
+    sizes = [min(block_size, num_trials - b * block_size) for b in range(num_blocks)]
+    return list(zip(sizes, seeds))
+
+
+def merge_blocks(results):
+    merged = results[0]
+    for accs in results[1:]:
+        merged = {name: merge(merged[name], accs[name]) for name in merged}
+    return merged
+
+
+def aggregate(results):
+    return {name: summary(acc) for name, acc in merge_blocks(results).items()}
+
+
+def target_reached(accs, target, observable):
+    stats = summary(accs[observable])
+    return stats["count"] >= 2 and stats["stderr"].max() <= target
+
+
+def sweep(lattice, L, p_values, num_trials, workers=1, block_size=10, seed=None, periodic=False, store=None,
+          target=None, target_observable="largest"):
+    # With a target, blocks are merged in block order and the sweep stops at
+    # the first prefix whose largest standard error over p is <= target; the
+    # prefix, and so the result, does not depend on the worker count.
+    if num_trials <= 0:
+        raise ValueError(f"num_trials must be positive, got {num_trials}")
+    p_values = np.asarray(p_values, dtype=float)
+    done = {}
+    if store is not None:
+        config = {
+            "lattice": lattice,
+            "L": L,
+            "p_values": p_values.tolist(),
+            "num_trials": num_trials,
+            "block_size": block_size,
+            "periodic": periodic,
+            "seed": seed,
+        }
+        seed = open_store(store, config)["seed"]
+        done = load_blocks(store)
+
+    blocks = trial_blocks(num_trials, block_size, seed)
+    tasks = [(b, (lattice, L, p_values, n, s, periodic)) for b, (n, s) in enumerate(blocks) if b not in done]
+    results = dict(done)
+    merged = None
+    used = 0
+
+    def advance():
+        # Merge the contiguous run of finished blocks; True once on target
+        nonlocal merged, used
+        while used in results:
+            merged = results[used] if merged is None else merge_blocks([merged, results[used]])
+            used += 1
+            if target is not None and target_reached(merged, target, target_observable):
+                return True
+        return False
+
+    def finish(block, result):
+        results[block] = result
+        if store is not None:
+            append_block(store, block, result)
+        return advance()
+
+    if advance():
+        tasks = []
+    progress = tqdm(total=len(tasks))
+    if workers == 1:
+        for block, task in tasks:
+            stop = finish(block, run_block(*task))
+            progress.update()
+            if stop:
+                break
+    elif tasks:
+        with ProcessPoolExecutor(workers) as pool:
+            queue = iter(tasks)
+            futures = {pool.submit(run_block, *task): block for block, task in islice(queue, 2 * workers)}
+            while futures:
+                future = next(as_completed(futures))
+                stop = finish(futures.pop(future), future.result())
+                progress.update()
+                if stop:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                for block, task in islice(queue, 1):
+                    futures[pool.submit(run_block, *task)] = block
+    progress.close()
+    return {name: summary(acc) for name, acc in merged.items()}
+
+
+def to_frame(p_values, stats):
+    # Observables without a named column (e.g. the n_s_k histogram bins)
+    # keep their own name
+    df = pd.DataFrame({"p": p_values})
+    for name, s in stats.items():
+        column = COLUMNS.get(name, name)
+        df[column] = s["mean"]
+        for key in ("var", "stderr", "binder"):
+            df[column + "_" + key] = s[key]
+    return df
@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+from percolation.runner import COLUMNS, sweep, to_frame, aggregate
+from percolation.store import load_blocks, read_config
+
+
+# Finite-size scaling. A ladder of sizes is swept into one store per L, and
+# p_c and nu are extrapolated from the stored blocks in two ways:
+#   - crossings: neighbouring sizes cross at p*, and the ratio of their
+#     slopes there gives 1/nu = ln(s2 / s1) / ln(L2 / L1)
+#   - collapse: y_L(p) = f((p - p_c) L^(1/nu)), fitted by putting one
+#     polynomial through every size at once. Only points inside the central
+#     band of each curve take part, so the data do not change with p_c, nu.
+# Confidence intervals come from resampling the stored blocks of every size.
+
+NU_BOUNDS = (0.2, 5.0)
+
+
+def store_path(root, lattice, L):
+    return os.path.join(root, f"{lattice}_L{L}")
+
+
+def ladder_sweeps(lattice, sizes, p_values, num_trials, root, workers=1, block_size=10, seed=None,
+                  periodic=False, target=None):
+    # Sizes get distinct seeds; finished sizes and blocks are resumed.
+    paths = []
+    for L in sizes:
+        path = store_path(root, lattice, L)
+        sweep(lattice, L, p_values, num_trials, workers=workers, block_size=block_size,
+              seed=None if seed is None else [seed, L], periodic=periodic, store=path, target=target)
+        paths.append(path)
+    return paths
+
+
+def crossing(p, y1, y2):
+    # Where the smaller size drops below the larger one, with the slopes of
+    # both curves there. Noise can add shallow crossings far from p_c, so
+    # the steepest one wins.
+    d = y1 - y2
+    i = np.flatnonzero((d[:-1] > 0) & (d[1:] <= 0))
+    if len(i) == 0:
+        return np.nan, np.nan, np.nan
+    i = i[np.argmax(d[i] - d[i + 1])]
+    t = d[i] / (d[i] - d[i + 1])
+    step = p[i + 1] - p[i]
+    return p[i] + t * step, (y1[i + 1] - y1[i]) / step, (y2[i + 1] - y2[i]) / step
+
+
+def crossings(sizes, p, curves):
+    rows = []
+    for (L1, y1), (L2, y2) in zip(zip(sizes, curves), zip(sizes[1:], curves[1:])):
+        p_cross, s1, s2 = crossing(p, y1, y2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nu = np.log(L2 / L1) / np.log(s2 / s1)
+        rows.append({"L1": L1, "L2": L2, "p_cross": p_cross, "nu": nu})
+    return pd.DataFrame(rows)
+
+
+def collapse_cost(params, sizes, p, curves, errors, degree):
+    p_c, nu = params
+    x = np.concatenate([(p - p_c) * L ** (1 / nu) for L, p in zip(sizes, p)])
+    y = np.concatenate(curves)
+    err = np.concatenate(errors)
+    poly = np.polyfit(x, y, degree, w=1 / err)
+    return np.sum(((y - np.polyval(poly, x)) / err) ** 2) / (len(x) - degree - 1)
+
+
+def collapse(sizes, p, curves, errors, p_c, nu, band=(0.1, 0.9), degree=3):
+    # Errors of exactly zero (e.g. p = 0) are floored at the smallest
+    # nonzero error so they do not dominate the weights.
+    positive = np.concatenate(errors)
+    floor = positive[positive > 0].min() if np.any(positive > 0) else 1.0
+    keep = []
+    for y in curves:
+        lo, hi = np.nanmin(y) + np.array(band) * (np.nanmax(y) - np.nanmin(y))
+        keep.append((y >= lo) & (y <= hi))
+    data = ([p[k] for k in keep], [y[k] for y, k in zip(curves, keep)],
+            [np.maximum(e[k], floor) for e, k in zip(errors, keep)])
+    if sum(k.sum() for k in keep) <= degree + 1:
+        return np.array([np.nan, np.nan])
+    bounds = [(p.min(), p.max()), NU_BOUNDS]
+    start = [np.clip(p_c, *bounds[0]), np.clip(nu, *NU_BOUNDS)]
+    fit = minimize(collapse_cost, start, args=(sizes, data[0], data[1], data[2], degree),
+                   method="Nelder-Mead", bounds=bounds, options={"xatol": 1e-6, "fatol": 1e-6})
+    return fit.x
+
+
+def ladder_curves(frames, column):
+    curves = [df[column].to_numpy() for df in frames]
+    if column + "_stderr" in frames[0]:
+        errors = [df[column + "_stderr"].to_numpy() for df in frames]
+    else:
+        errors = [np.ones(len(df)) for df in frames]
+    return curves, errors
+
+
+def estimate(sizes, p, frames, column, nu_guess=1.0, band=(0.1, 0.9), degree=3):
+    curves, errors = ladder_curves(frames, column)
+    table = crossings(sizes, p, curves)
+    # The largest pair has the smallest corrections to scaling
+    last = table.iloc[-1]
+    p_c = last["p_cross"]
+    nu = last["nu"] if np.isfinite(last["nu"]) and last["nu"] > 0 else nu_guess
+    if not np.isfinite(nu):
+        nu = 1.0
+    start = (p_c if np.isfinite(p_c) else p[np.argmax(np.gradient(curves[-1], p))], nu)
+    fit = collapse(sizes, p, curves, errors, *start, band, degree)
+    return table, {"crossing": (last["p_cross"], last["nu"]), "collapse": tuple(fit)}
+
+
+def resample(done, rng):
+    blocks = [done[b] for b in sorted(done)]
+    return aggregate([blocks[i] for i in rng.integers(len(blocks), size=len(blocks))])
+
+
+def finite_size_scaling(paths, observable="spanning", nu_guess=1.0, band=(0.1, 0.9), degree=3, num_bootstrap=100,
+                        seed=None, level=0.95):
+    configs = [read_config(path) for path in paths]
+    sizes = np.array([c["L"] for c in configs], dtype=float)
+    p = np.asarray(configs[0]["p_values"])
+    done = [load_blocks(path) for path in paths]
+    column = COLUMNS[observable] if observable in COLUMNS else observable
+    frames = [to_frame(p, aggregate([d[b] for b in sorted(d)])) for d in done]
+    table, point = estimate(sizes, p, frames, column, nu_guess, band, degree)
+
+    rng = np.random.default_rng(seed)
+    samples = {method: [] for method in point}
+    for _ in range(num_bootstrap):
+        frames = [to_frame(p, resample(d, rng)) for d in done]
+        _, boot = estimate(sizes, p, frames, column, point["collapse"][1], band, degree)
+        for method, values in boot.items():
+            samples[method].append(values)
+
+    rows = []
+    q = [(1 - level) / 2, (1 + level) / 2]
+    for method, (p_c, nu) in point.items():
+        boot = np.array(samples[method], dtype=float).reshape(-1, 2)
+        (p_lo, nu_lo), (p_hi, nu_hi) = np.nanquantile(boot, q, axis=0) if len(boot) else ((np.nan,) * 2,) * 2
+        rows.append({"method": method, "p_c": p_c, "p_c_lo": p_lo, "p_c_hi": p_hi,
+                     "nu": nu, "nu_lo": nu_lo, "nu_hi": nu_hi})
+    return {"crossings": table, "estimates": pd.DataFrame(rows)}
@@ -0,0 +1,63 @@
+import numpy as np
+
+
+# Streaming moments of an observable at every p: Welford's running mean and
+# M2 for the standard error of the mean, plus running raw <x^2> and <x^4>
+# for the variance and Binder cumulant. For Newman-Ziff trials x is the
+# convolved curve, whose spread across trials is far smaller than that of
+# the observable itself, so x2 and x4 must be the convolved powers of the
+# per-bond curve rather than powers of x. Accumulators from separate blocks
+# merge exactly, so trials are never kept and workers can be combined in
+# any grouping.
+
+def moments(size):
+    return {
+        "count": 0,
+        "mean": np.zeros(size),
+        "m2": np.zeros(size),
+        "x2": np.zeros(size),
+        "x4": np.zeros(size),
+    }
+
+
+def push(acc, x, x2=None, x4=None):
+    # x2 and x4 default to the powers of x, for direct samples at each p
+    x2 = x ** 2 if x2 is None else x2
+    x4 = x ** 4 if x4 is None else x4
+    acc["count"] += 1
+    n = acc["count"]
+    delta = x - acc["mean"]
+    acc["mean"] += delta / n
+    acc["m2"] += delta * (x - acc["mean"])
+    acc["x2"] += (x2 - acc["x2"]) / n
+    acc["x4"] += (x4 - acc["x4"]) / n
+
+
+def merge(a, b):
+    na, nb = a["count"], b["count"]
+    n = na + nb
+    if na == 0 or nb == 0:
+        return dict(b if na == 0 else a)
+    delta = b["mean"] - a["mean"]
+    return {
+        "count": n,
+        "mean": a["mean"] + delta * nb / n,
+        "m2": a["m2"] + b["m2"] + delta ** 2 * na * nb / n,
+        "x2": (na * a["x2"] + nb * b["x2"]) / n,
+        "x4": (na * a["x4"] + nb * b["x4"]) / n,
+    }
+
+
+def summary(acc):
+    n = acc["count"]
+    var = np.maximum(acc["x2"] - acc["mean"] ** 2, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        binder = 1 - acc["x4"] / (3 * acc["x2"] ** 2)
+    return {
+        "count": n,
+        "mean": acc["mean"],
+        "var": var,
+        # undefined (inf) until a second trial gives a spread
+        "stderr": np.sqrt(acc["m2"] / (n - 1) / n) if n > 1 else np.full(len(acc["mean"]), np.inf),
+        "binder": binder,
+    }
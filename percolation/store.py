@@ -0,0 +1,95 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# A store is a directory holding the sweep configuration and an append-only
+# CSV of per-block results, one row per (block, p). Blocks are appended as
+# soon as they finish, so a killed sweep resumes from the blocks on disk.
+
+CONFIG = "config.json"
+BLOCKS = "blocks.csv"
+MOMENTS = ("mean", "m2", "x2", "x4")
+
+
+def open_store(path, config):
+    os.makedirs(path, exist_ok=True)
+    config_path = os.path.join(path, CONFIG)
+    if os.path.exists(config_path):
+        with open(config_path) as f:
+            saved = json.load(f)
+        keys = [k for k in config if not (k == "seed" and config[k] is None)]
+        if any(saved.get(k) != config[k] for k in keys):
+            raise ValueError(f"store {path!r} was written by a different sweep configuration")
+        return saved
+    config = dict(config)
+    if config["seed"] is None:
+        config["seed"] = np.random.SeedSequence().entropy
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=2)
+    return config
+
+
+def read_config(path):
+    with open(os.path.join(path, CONFIG)) as f:
+        return json.load(f)
+
+
+def append_block(path, block, result):
+    count = next(iter(result.values()))["count"]
+    num_p = len(next(iter(result.values()))["mean"])
+    df = pd.DataFrame({"block": block, "count": count, "p_index": np.arange(num_p)})
+    for name, acc in result.items():
+        for key in MOMENTS:
+            df[f"{name}_{key}"] = acc[key]
+    blocks_path = os.path.join(path, BLOCKS)
+    header = not os.path.exists(blocks_path)
+    with open(blocks_path, "a") as f:
+        f.write(df.to_csv(index=False, header=header))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_blocks(path):
+    # Finished blocks as {block: {observable: moments}}; rows of a block torn
+    # by a crash mid-write are ignored so that block is simply rerun.
+    blocks_path = os.path.join(path, BLOCKS)
+    if not os.path.exists(blocks_path):
+        return {}
+    num_p = len(read_config(path)["p_values"])
+    df = pd.read_csv(blocks_path, on_bad_lines="skip", float_precision="round_trip").dropna()
+    df = df.drop_duplicates(["block", "p_index"], keep="last").sort_values(["block", "p_index"])
+    names = [c[:-len("_mean")] for c in df.columns if c.endswith("_mean")]
+    done = {}
+    for block, rows in df.groupby("block"):
+        if len(rows) != num_p:
+            continue
+        count = int(rows["count"].iloc[0])
+        done[int(block)] = {
+            name: dict({key: rows[f"{name}_{key}"].to_numpy() for key in MOMENTS}, count=count) for name in names
+        }
+    return done
+
+
+def load_results(path):
+    # Aggregate whatever blocks have finished so far into the usual layout
+    from percolation.runner import aggregate, to_frame
+
+    done = load_blocks(path)
+    p_values = read_config(path)["p_values"]
+    if not done:
+        return pd.DataFrame({"p": p_values})
+    return to_frame(p_values, aggregate([done[b] for b in sorted(done)]))
+
+
+def read_results(name):
+    # Results for plotting: the store directory `name` while it has finished
+    # blocks (so a running sweep can be plotted), otherwise the finished
+    # name + ".csv", or None when neither exists yet
+    if os.path.isdir(name) and load_blocks(name):
+        return load_results(name)
+    if os.path.exists(name + ".csv"):
+        return pd.read_csv(name + ".csv")
+    return None
@@ -0,0 +1,70 @@
+import numpy as np
+
+from percolation import backend
+from percolation.labeling import label_clusters
+from percolation.newman_ziff import find
+
+
+# For a fixed realization the bonds open at p are exactly the bonds whose
+# threshold is below p, i.e. a prefix of the bonds sorted by threshold. The
+# timeline runs union-find once over that ordering and keeps compressed
+# labels every `every` bonds, so the labeling at any p is a binary search
+# plus a replay of at most `every` bonds on top of the nearest snapshot.
+
+def compress(parent):
+    parent = np.asarray(parent, dtype=np.int32)
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent = grand
+
+
+def union_find_snapshots(num_sites, pairs, every):
+    parent = list(range(num_sites))
+    size = [1] * num_sites
+    snapshots = [compress(parent)]
+    for n, (a, b) in enumerate(pairs.tolist(), 1):
+        ra = find(parent, a)
+        rb = find(parent, b)
+        if ra != rb:
+            if size[ra] < size[rb]:
+                ra, rb = rb, ra
+            parent[rb] = ra
+            size[ra] += size[rb]
+        if n % every == 0:
+            snapshots.append(compress(parent))
+    return snapshots
+
+
+def build_timeline(num_sites, pairs, thresholds, num_snapshots=32):
+    order = np.argsort(thresholds, kind="stable")
+    pairs = pairs[order]
+    every = max(1, -(-len(pairs) // num_snapshots))
+    if backend.use_numba():
+        from percolation import kernels
+        snapshots = kernels.timeline_kernel(num_sites, pairs, every)
+    else:
+        snapshots = union_find_snapshots(num_sites, pairs, every)
+    return {
+        "thresholds": thresholds[order],
+        "pairs": pairs,
+        "every": every,
+        "snapshots": snapshots,
+    }
+
+
+def open_count(timeline, p):
+    return int(np.searchsorted(timeline["thresholds"], p, side="left"))
+
+
+def timeline_labels(timeline, p):
+    m = open_count(timeline, p)
+    s = min(m // timeline["every"], len(timeline["snapshots"]) - 1)
+    labels = timeline["snapshots"][s]
+    chunk = timeline["pairs"][s * timeline["every"]:m]
+    if len(chunk) == 0:
+        return labels
+    # Merge the remaining bonds between snapshot roots in one pass
+    merged = label_clusters(len(labels), labels[chunk])
+    return merged[labels]
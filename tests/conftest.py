@@ -0,0 +1,12 @@
+import pytest
+
+from percolation import backend
+
+
+@pytest.fixture(params=backend.BACKENDS)
+def each_backend(request, monkeypatch):
+    # Runs the test once per backend, skipping numba when it is missing
+    if request.param == "numba" and not backend.HAVE_NUMBA:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(backend, "backend", request.param)
+    return request.param
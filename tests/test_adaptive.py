@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from percolation.adaptive import adaptive_sweep, steepest_p
+
+
+@pytest.mark.parametrize("p_range", [(0.3, 0.7), (0.45, 0.55)])
+def test_adaptive_sweep_terminates_for_short_grids(p_range):
+    result = adaptive_sweep("square", 8, p_range, target=1.0, max_trials=40, block_size=5, seed=0, num_points=2)
+    assert p_range[0] <= result["p_c"] <= p_range[1]
+
+
+def test_adaptive_sweep_needs_trials():
+    with pytest.raises(ValueError):
+        adaptive_sweep("square", 8, (0.3, 0.7), target=0.01, max_trials=0)
+
+
+def test_steepest_p_finds_the_step_of_a_sharp_curve():
+    # A curve that jumps at n = 600 of M = 1000 bonds is steepest at p = 0.6
+    M = 1000
+    curve = (np.arange(M + 1) >= 600).astype(float)
+    assert steepest_p(curve, M, 0.3, 0.9) == pytest.approx(0.6, abs=0.01)
+
+
+@pytest.mark.parametrize("max_trials, block_size", [(5, 10), (45, 10), (23, 4)])
+def test_adaptive_sweep_respects_the_trial_cap(max_trials, block_size):
+    result = adaptive_sweep("square", 8, (0.3, 0.7), target=0.0, max_trials=max_trials, block_size=block_size, seed=1)
+    assert result["trials"] == max_trials
+
+
+def test_adaptive_sweep_does_not_depend_on_worker_count():
+    serial = adaptive_sweep("square", 8, (0.3, 0.7), target=0.02, max_trials=80, block_size=5, seed=4)
+    pooled = adaptive_sweep("square", 8, (0.3, 0.7), target=0.02, max_trials=80, block_size=5, seed=4, workers=3)
+    assert serial["trials"] == pooled["trials"]
+    np.testing.assert_array_equal(serial["estimates"], pooled["estimates"])
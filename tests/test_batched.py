@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from percolation.batched import batch_trials, generate_batch
+from percolation.lattice import center_site, lattice_faces, hypercubic_bond_pairs
+from percolation.labeling import label_clusters, cluster_stats
+
+
+@pytest.mark.parametrize("L, d, periodic", [(12, 2, False), (5, 3, False), (5, 3, True), (4, 4, False)])
+def test_batched_matches_per_trial(each_backend, L, d, periodic):
+    trials, origin = 6, center_site(L, d)
+    faces = None if periodic else lattice_faces(L, d)[-1]
+    stats = batch_trials(L, d, 0.45, np.random.default_rng(1), trials, periodic)
+    bonds = generate_batch(L, d, 0.45, np.random.default_rng(1), trials, periodic)
+    for t in range(trials):
+        pairs = hypercubic_bond_pairs([mask[t] for mask in bonds], periodic)
+        single = cluster_stats(label_clusters(L ** d, pairs), origin, [] if periodic else [faces])
+        assert stats["largest"][t] == single["largest"]
+        assert stats["second"][t] == single["second"]
+        assert stats["origin"][t] == single["origin"]
+        if not periodic:
+            assert stats["spanning"][t] == single["spanning"][0]
+            assert stats["strength"][t] == pytest.approx(single["strength"][0])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from percolation.bitpacked import generate_packed, pack_bonds, unpack_bonds, packed_cluster_stats, packed_neighbors
+from percolation.lattice import center_site, lattice_faces, generate_hypercubic, hypercubic_bond_pairs
+from percolation.labeling import label_clusters, cluster_stats
+
+
+@pytest.mark.parametrize("L, d", [(20, 2), (8, 3), (5, 4)])
+@pytest.mark.parametrize("p", [0.3, 0.5, 0.7])
+def test_bitpacked_matches_full_labeling(L, d, p):
+    bonds = generate_hypercubic(L, d, p, np.random.default_rng(2))
+    packed = generate_packed(L, d, p, np.random.default_rng(2))
+    for full, unpacked in zip(bonds, unpack_bonds(packed, L)):
+        np.testing.assert_array_equal(full, unpacked)
+    for bits, repacked in zip(packed, pack_bonds(bonds)):
+        np.testing.assert_array_equal(bits, repacked)
+    origin = center_site(L, d)
+    full = cluster_stats(label_clusters(L ** d, hypercubic_bond_pairs(bonds)), origin, [lattice_faces(L, d)[0]])
+    stats = packed_cluster_stats(packed, L, origin)
+    sizes = np.flatnonzero(full["histogram"])
+    assert stats["largest"] == full["largest"]
+    assert stats["origin"] == full["origin"]
+    assert stats["spanning"] == full["spanning"][0]
+    np.testing.assert_array_equal(stats["sizes"], sizes)
+    np.testing.assert_array_equal(stats["counts"], full["histogram"][sizes])
+
+
+def test_packed_neighbors_match_open_bonds():
+    L, d = 6, 3
+    bonds = generate_hypercubic(L, d, 0.5, np.random.default_rng(3))
+    packed = pack_bonds(bonds)
+    pairs = hypercubic_bond_pairs(bonds)
+    for site in (0, center_site(L, d), L ** d - 1, 37):
+        expected = np.sort(np.concatenate([pairs[pairs[:, 0] == site, 1], pairs[pairs[:, 1] == site, 0]]))
+        np.testing.assert_array_equal(packed_neighbors(packed, L, site), expected)
+
+
+def test_packed_bonds_use_one_bit_each():
+    # Up to 7 bits of padding per packed row, at most L^2 rows per axis
+    L = 64
+    packed = generate_packed(L, 3, 0.25, np.random.default_rng(0))
+    num_bonds = 3 * L * L * (L - 1)
+    assert num_bonds <= 8 * sum(bits.nbytes for bits in packed) <= num_bonds + 3 * 7 * L * L
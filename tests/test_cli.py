@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from percolation.cli import main, parse_p
+
+
+def test_parse_p():
+    np.testing.assert_allclose(parse_p("0.2:0.4:3"), [0.2, 0.3, 0.4])
+    np.testing.assert_allclose(parse_p("0.1,0.5"), [0.1, 0.5])
+
+
+def test_sweep_writes_csv(tmp_path):
+    out = tmp_path / "square.csv"
+    main(["sweep", "--lattice", "square", "--L", "8", "--p", "0.3:0.7:5", "--trials", "20", "--workers", "1",
+          "--seed", "1", "--out", str(out)])
+    df = pd.read_csv(out)
+    np.testing.assert_allclose(df["p"], [0.3, 0.4, 0.5, 0.6, 0.7])
+    for column in ("mean_cluster_size", "largest_components", "crossing_probability"):
+        assert column in df and column + "_stderr" in df
+    assert np.all(np.diff(df["largest_components"]) > 0)
+
+
+def test_sweep_resumes_from_store(tmp_path):
+    args = ["sweep", "--lattice", "square", "--L", "8", "--p", "0.5", "--trials", "20", "--workers", "1",
+            "--seed", "2", "--store", str(tmp_path / "store")]
+    main(args + ["--out", str(tmp_path / "a.csv")])
+    main(args + ["--out", str(tmp_path / "b.csv")])
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "a.csv"), pd.read_csv(tmp_path / "b.csv"))
+
+
+def test_invade_and_adaptive(tmp_path, capsys):
+    main(["invade", "--lattice", "square", "--L", "16", "--trials", "3", "--seed", "0",
+          "--out", str(tmp_path / "invade.csv")])
+    assert len(pd.read_csv(tmp_path / "invade.csv")) == 3
+    main(["adaptive", "--lattice", "square", "--L", "8", "--p", "0.3,0.7", "--trials", "20", "--workers", "1",
+          "--block-size", "5", "--target", "0.5", "--seed", "0", "--out", str(tmp_path / "adaptive.csv")])
+    assert "p_c =" in capsys.readouterr().out
+
+
+def test_unknown_lattice_is_rejected(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["sweep", "--lattice", "hexagon", "--L", "8", "--out", str(tmp_path / "x.csv")])
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from percolation.complete import num_edges, edge_pairs, gnp_edges, gnp_largest, random_edges, max_edges, complete_sweep
+
+
+def test_edge_pairs_enumerate_every_edge_once():
+    n = 40
+    pairs = edge_pairs(np.arange(num_edges(n)))
+    assert np.all(pairs[:, 1] < pairs[:, 0])
+    assert np.all(pairs[:, 0] < n)
+    assert len(np.unique(pairs, axis=0)) == num_edges(n)
+
+
+def test_edge_pairs_stay_exact_for_large_indices():
+    # Past 2^53 the float square root alone can be off by one
+    i = np.array([10 ** 8, 3 * 10 ** 8 + 7], dtype=np.int64)
+    j = np.array([0, 3 * 10 ** 8 + 6], dtype=np.int64)
+    pairs = edge_pairs(i * (i - 1) // 2 + j)
+    np.testing.assert_array_equal(pairs, np.stack([i, j], axis=1))
+
+
+@pytest.mark.parametrize("m", [10, 700, 1225])
+def test_random_edges_are_distinct(m):
+    edges = random_edges(50, m, np.random.default_rng(0))
+    assert len(edges) == m
+    assert len(np.unique(edges, axis=0)) == m
+
+
+@pytest.mark.parametrize("p", [0.0, 0.01, 0.3, 1.0])
+def test_gnp_edges_have_binomial_count(p):
+    n = 200
+    counts = np.array([len(gnp_edges(n, p, np.random.default_rng(s))) for s in range(20)])
+    M = num_edges(n)
+    # mean of 20 draws within 5 standard errors of M p
+    assert abs(counts.mean() - M * p) <= 5 * np.sqrt(M * p * (1 - p) / 20) + 1e-9
+    edges = gnp_edges(n, p, np.random.default_rng(0))
+    assert len(np.unique(edges, axis=0)) == len(edges)
+
+
+def test_gnp_giant_component():
+    # Above p = 1/n a giant component holds a finite fraction of the vertices
+    n = 2000
+    assert gnp_largest(n, 0.5 / n, np.random.default_rng(0)) < 0.05
+    assert gnp_largest(n, 3.0 / n, np.random.default_rng(0)) > 0.8
+
+
+def test_complete_sweep_covers_the_window():
+    n, p_max = 300, 0.02
+    curves = complete_sweep(n, p_max, np.random.default_rng(1))
+    assert len(curves["largest"]) == max_edges(n, p_max) + 1
+    assert curves["largest"][-1] <= n
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from percolation.invasion import invade, invasion_targets, invasion_trials
+from percolation.labeling import label_clusters
+from percolation.realizations import save_realizations, load_realizations
+from percolation.runner import lattice_graph
+
+
+def bottleneck(num_sites, pairs, thresholds, seeds, targets):
+    # Smallest threshold at which the bonds below it join a seed to a target
+    for t in np.sort(thresholds):
+        labels = label_clusters(num_sites, pairs[thresholds <= t])
+        if np.intersect1d(labels[seeds], labels[targets]).size:
+            return t
+
+
+@pytest.mark.parametrize("lattice, L, start", [("square", 10, "left"), ("square", 9, "center"),
+                                               ("triangle", 8, "left"), ("cube", 5, "left")])
+def test_p_c_is_the_bottleneck_threshold(lattice, L, start):
+    num_sites, edges = lattice_graph(lattice, L)[:2]
+    seeds, targets = invasion_targets(lattice, L, start)
+    for seed in range(3):
+        thresholds = np.random.default_rng(seed).random(len(edges))
+        result = invade(num_sites, edges, thresholds, seeds, targets)
+        assert result["reached"]
+        assert result["p_c"] == bottleneck(num_sites, edges, thresholds, seeds, targets)
+        assert result["size"] == len(np.unique(seeds)) + len(result["accepted"])
+
+
+def test_trials_are_seeded():
+    first = invasion_trials("square", 12, 5, seed=4)
+    assert np.array_equal(first, invasion_trials("square", 12, 5, seed=4))
+    assert np.all((first > 0) & (first < 1))
+
+
+def test_trials_from_realizations(tmp_path):
+    path = str(tmp_path / "square")
+    save_realizations(path, "square", 12, 3, seed=2)
+    estimates = invasion_trials("square", 12, 10, realizations=load_realizations(path))
+    assert len(estimates) == 3
+    assert np.all((estimates > 0) & (estimates < 1))
+
+
+def test_targets_need_faces():
+    with pytest.raises(ValueError):
+        invasion_targets("complete", 10)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from percolation import backend
+from percolation.lattice import center_site, lattice_faces, cube_edges, square_edges
+from percolation.newman_ziff import newman_ziff
+from percolation.timeline import build_timeline
+
+
+@pytest.fixture
+def both_backends(monkeypatch):
+    if not backend.HAVE_NUMBA:
+        pytest.skip("numba is not installed")
+
+    def run(fn):
+        results = {}
+        for name in backend.BACKENDS:
+            monkeypatch.setattr(backend, "backend", name)
+            results[name] = fn()
+        return results
+    return run
+
+
+def test_backends_give_identical_curves(both_backends):
+    L, d = 8, 3
+    curves = both_backends(lambda: newman_ziff(L ** d, cube_edges(L), np.random.default_rng(7),
+                                               center_site(L, d), lattice_faces(L, d)[-1]))
+    assert curves["python"].keys() == curves["numba"].keys()
+    for name in curves["python"]:
+        np.testing.assert_array_equal(curves["python"][name], curves["numba"][name])
+
+
+def test_backends_give_identical_snapshots(both_backends):
+    L = 16
+    edges = square_edges(L)
+    thresholds = np.random.default_rng(2).random(len(edges))
+    timelines = both_backends(lambda: build_timeline(L * L, edges, thresholds, 8))
+    np.testing.assert_array_equal(timelines["python"]["snapshots"], timelines["numba"]["snapshots"])
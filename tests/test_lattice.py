@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from percolation.lattice import (generate_triangle, triangle_bond_pairs, triangle_edges, hypercubic_edges,
+                                 generate_hypercubic, hypercubic_bond_pairs, cube_bond_pairs)
+from percolation.labeling import measure
+
+
+def offset_x(L, sites):
+    # Odd rows are drawn shifted right by half a cell
+    i, j = np.divmod(sites, L)
+    return j + 0.5 * (i % 2)
+
+
+def test_triangle_diagonals_alternate_with_row_parity():
+    L = 4
+    diagonals = triangle_edges(L)[2 * L * (L - 1):]
+    i, j = np.divmod(diagonals, L)
+    assert np.all(i[:, 1] == i[:, 0] + 1)
+    # even rows run down-left, odd rows down-right
+    np.testing.assert_array_equal(j[:, 1] - j[:, 0], np.where(i[:, 0] % 2 == 0, -1, 1))
+
+
+def test_triangle_bonds_join_drawn_neighbours():
+    # Every bond is a horizontal step of 1 or a step of half a cell to the
+    # next row, so each drawn site has the six triangular neighbours
+    L = 6
+    edges = triangle_edges(L)
+    dx = np.abs(offset_x(L, edges[:, 1]) - offset_x(L, edges[:, 0]))
+    dy = np.abs(edges[:, 1] // L - edges[:, 0] // L)
+    assert set(zip(dx.tolist(), dy.tolist())) == {(1.0, 0), (0.5, 1)}
+    degree = np.bincount(edges.ravel(), minlength=L * L).reshape(L, L)
+    assert np.all(degree[1:-1, 1:-1] == 6)
+
+
+def test_triangle_masks_select_their_bonds():
+    L = 7
+    bonds = generate_triangle(L, 0.5, np.random.default_rng(0))
+    full = triangle_edges(L)
+    open_mask = np.concatenate([mask.ravel() for mask in bonds])
+    np.testing.assert_array_equal(triangle_bond_pairs(*bonds), full[open_mask])
+
+
+@pytest.mark.parametrize("L, d", [(3, 2), (5, 3), (4, 4), (3, 5)])
+def test_periodic_hypercubic_is_2d_regular(L, d):
+    edges = hypercubic_edges(L, d, periodic=True)
+    assert len(edges) == d * L ** d
+    assert len(np.unique(np.sort(edges, axis=1), axis=0)) == len(edges)
+    np.testing.assert_array_equal(np.bincount(edges.ravel(), minlength=L ** d), 2 * d)
+
+
+@pytest.mark.parametrize("L, d", [(5, 2), (4, 3), (3, 4)])
+def test_open_hypercubic_edge_count(L, d):
+    assert len(hypercubic_edges(L, d)) == d * L ** (d - 1) * (L - 1)
+
+
+def test_periodic_bonds_wrap_round():
+    # Rows of open bonds along the last axis close into rings of L sites
+    L = 6
+    rows = (np.zeros((L, L), bool), np.ones((L, L), bool))
+    pairs = hypercubic_bond_pairs(rows, periodic=True)
+    assert [L - 1, 0] in pairs.tolist()
+    assert measure(L * L, pairs)["largest"] == L
+    open_rows = (np.zeros((L - 1, L), bool), np.ones((L, L - 1), bool))
+    assert [L - 1, 0] not in hypercubic_bond_pairs(open_rows).tolist()
+
+
+def test_hypercubic_matches_cube_for_d3():
+    # Axis order (z, y, x) is generate_cube's (x_bonds, y_bonds, z_bonds) reversed
+    L = 5
+    z, y, x = generate_hypercubic(L, 3, 0.5, np.random.default_rng(1))
+    pairs = hypercubic_bond_pairs((z, y, x))
+    assert set(map(tuple, pairs.tolist())) == set(map(tuple, cube_bond_pairs(x, y, z).tolist()))
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from percolation.lattice import center_site, lattice_faces, square_edges, cube_edges, triangle_edges
+from percolation.labeling import measure
+from percolation.newman_ziff import newman_ziff
+
+
+@pytest.mark.parametrize("L, d, edges", [(6, 2, square_edges(6)), (4, 3, cube_edges(4)), (6, 2, triangle_edges(6))])
+def test_curves_match_labeling_at_every_bond_count(each_backend, L, d, edges):
+    num_sites, origin, faces = L ** d, center_site(L, d), lattice_faces(L, d)[-1]
+    curves = newman_ziff(num_sites, edges, np.random.default_rng(3), origin, faces)
+    order = np.random.default_rng(3).permutation(len(edges))
+    for n in range(len(edges) + 1):
+        stats = measure(num_sites, edges[order[:n]], origin, [faces])
+        assert curves["largest"][n] == stats["largest"]
+        assert curves["second"][n] == stats["second"]
+        assert curves["finite"][n] == pytest.approx(stats["finite"])
+        assert curves["origin"][n] == stats["origin"]
+        assert curves["spanning"][n] == stats["spanning"][0]
+        assert curves["strength"][n] == pytest.approx(stats["strength"][0] * num_sites)
+
+
+def test_size_bins_match_log_binned(each_backend):
+    L = 8
+    edges = square_edges(L)
+    curves = newman_ziff(L * L, edges, np.random.default_rng(5))
+    order = np.random.default_rng(5).permutation(len(edges))
+    bins = sorted((k for k in curves if k.startswith("n_s_")), key=lambda k: int(k[4:]))
+    for n in range(len(edges) + 1):
+        expected = measure(L * L, edges[order[:n]])["log_histogram"]
+        np.testing.assert_allclose([curves[k][n] for k in bins], expected)
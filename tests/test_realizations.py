@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from percolation.lattice import center_site, square_edges
+from percolation.labeling import measure
+from percolation.realizations import (LEVELS, save_realizations, load_realizations, bonds_at, open_level,
+                                      evaluate_realizations)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "square")
+    save_realizations(path, "square", 8, 4, seed=5)
+    thresholds = load_realizations(path)
+    assert thresholds.shape == (4, len(square_edges(8)))
+    assert thresholds.dtype == np.uint16
+    assert isinstance(thresholds, np.memmap)
+    first = np.array(thresholds)
+    # Saving again with the same configuration keeps the file
+    save_realizations(path, "square", 8, 4, seed=5)
+    np.testing.assert_array_equal(load_realizations(path), first)
+    with pytest.raises(ValueError):
+        save_realizations(path, "square", 16, 4, seed=5)
+
+
+def test_bonds_are_coupled_across_p():
+    thresholds = np.random.default_rng(0).integers(0, LEVELS, 1000, dtype=np.uint16)
+    assert open_level(0.0) == 0 and open_level(1.0) == LEVELS
+    assert not bonds_at(thresholds, 0.0).any() and bonds_at(thresholds, 1.0).all()
+    # Bonds open at p stay open at every larger p
+    assert np.all(bonds_at(thresholds, 0.3) <= bonds_at(thresholds, 0.6))
+
+
+def test_evaluate_matches_direct_labeling(tmp_path):
+    path = str(tmp_path / "square")
+    L, p_values = 8, np.array([0.3, 0.5, 0.7])
+    save_realizations(path, "square", L, 3, seed=1)
+    stats = evaluate_realizations(path, "square", L, p_values)
+    thresholds = load_realizations(path)
+    edges = square_edges(L)
+    for k, p in enumerate(p_values):
+        direct = [measure(L * L, edges[bonds_at(row, p)], center_site(L, 2)) for row in thresholds]
+        assert stats["origin"]["mean"][k] == pytest.approx(np.mean([s["origin"] for s in direct]))
+        assert stats["largest"]["mean"][k] == pytest.approx(np.mean([s["largest_fraction"] for s in direct]))
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from percolation.runner import sweep
+
+P_VALUES = np.linspace(0.3, 0.7, 9)
+
+
+def assert_same(a, b):
+    assert a.keys() == b.keys()
+    for name in a:
+        for key in ("mean", "var", "stderr", "binder"):
+            np.testing.assert_array_equal(a[name][key], b[name][key])
+
+
+def test_results_do_not_depend_on_worker_count():
+    serial = sweep("square", 8, P_VALUES, 40, workers=1, block_size=5, seed=11)
+    pooled = sweep("square", 8, P_VALUES, 40, workers=3, block_size=5, seed=11)
+    assert_same(serial, pooled)
+
+
+def test_sweep_needs_trials():
+    with pytest.raises(ValueError):
+        sweep("square", 8, P_VALUES, 0)
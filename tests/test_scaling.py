@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from percolation.scaling import crossing, crossings, collapse, ladder_sweeps, finite_size_scaling
+
+P_C, NU = 0.5, 4 / 3
+SIZES = [16, 32, 64, 128]
+
+
+def scaling_curves(p):
+    # Exact finite-size scaling form y_L(p) = f((p - p_c) L^(1/nu))
+    return [1 / (1 + np.exp(-(p - P_C) * L ** (1 / NU))) for L in SIZES]
+
+
+def test_crossing_interpolates_the_sign_change():
+    p = np.linspace(0, 1, 11)
+    p_cross, s1, s2 = crossing(p, 1 - p, p)
+    assert p_cross == pytest.approx(0.5)
+    assert (s1, s2) == pytest.approx((-1, 1))
+
+
+def test_crossing_without_sign_change():
+    p = np.linspace(0, 1, 11)
+    assert np.isnan(crossing(p, p + 1, p)[0])
+
+
+def test_crossings_recover_p_c_and_nu():
+    p = np.linspace(0.4, 0.6, 401)
+    table = crossings(SIZES, p, scaling_curves(p))
+    np.testing.assert_allclose(table["p_cross"], P_C, atol=1e-4)
+    np.testing.assert_allclose(table["nu"], NU, rtol=0.02)
+
+
+def test_collapse_recovers_p_c_and_nu():
+    p = np.linspace(0.42, 0.58, 81)
+    curves = scaling_curves(p)
+    errors = [np.full(len(p), 1e-3) for _ in SIZES]
+    p_c, nu = collapse(SIZES, p, curves, errors, p_c=0.48, nu=1.0)
+    assert p_c == pytest.approx(P_C, abs=1e-3)
+    assert nu == pytest.approx(NU, rel=0.03)
+
+
+def test_finite_size_scaling_from_stores(tmp_path):
+    paths = ladder_sweeps("square", [8, 16, 32], np.linspace(0.4, 0.6, 21), 40, str(tmp_path), block_size=10, seed=0)
+    result = finite_size_scaling(paths, "spanning", num_bootstrap=5, seed=0)
+    assert set(result["estimates"]["method"]) == {"crossing", "collapse"}
+    collapsed = result["estimates"].set_index("method").loc["collapse"]
+    assert 0.4 <= collapsed["p_c"] <= 0.6
+    assert collapsed["p_c_lo"] <= collapsed["p_c_hi"]
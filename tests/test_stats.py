@@ -0,0 +1,38 @@
+import numpy as np
+
+from percolation.runner import sweep
+from percolation.stats import moments, push, merge, summary
+
+P_VALUES = np.linspace(0.3, 0.7, 9)
+
+
+def test_merge_matches_single_pass():
+    rng = np.random.default_rng(0)
+    xs = rng.random((30, 4))
+    whole, parts = moments(4), [moments(4), moments(4)]
+    for k, x in enumerate(xs):
+        push(whole, x)
+        push(parts[k < 12], x)
+    merged = merge(*parts)
+    for key in ("mean", "m2", "x2", "x4"):
+        np.testing.assert_allclose(merged[key], whole[key])
+    np.testing.assert_allclose(summary(whole)["var"], xs.var(axis=0))
+
+
+def test_indicator_variance_is_bernoulli():
+    # Crossing is 0 or 1 in every configuration, so its variance at each p
+    # is P(1 - P) whatever the convolution does to the trial means
+    stats = sweep("square", 8, P_VALUES, 20, block_size=5, seed=3)["spanning"]
+    np.testing.assert_allclose(stats["var"], stats["mean"] * (1 - stats["mean"]), atol=1e-12)
+
+
+def test_stderr_is_undefined_for_one_trial():
+    acc = moments(3)
+    push(acc, np.array([0.1, 0.5, 0.9]))
+    assert np.all(np.isinf(summary(acc)["stderr"]))
+
+
+def test_target_needs_two_trials():
+    stats = sweep("square", 8, P_VALUES[:5], 1000, block_size=1, seed=2, target=0.05)["largest"]
+    assert stats["count"] >= 2
+    assert stats["stderr"].max() <= 0.05
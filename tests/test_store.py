@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from percolation.runner import sweep, to_frame
+from percolation.store import BLOCKS, open_store, read_results
+
+P_VALUES = np.linspace(0.3, 0.7, 9)
+
+
+def assert_same(a, b):
+    assert a.keys() == b.keys()
+    for name in a:
+        for key in ("mean", "var", "stderr", "binder"):
+            np.testing.assert_array_equal(a[name][key], b[name][key])
+
+
+def test_store_resumes_after_lost_blocks(tmp_path):
+    store = str(tmp_path / "store")
+    full = sweep("square", 8, P_VALUES, 40, block_size=5, seed=12, store=store)
+    # Keep only the rows of blocks 0 and 1, as if the sweep had been killed
+    path = os.path.join(store, BLOCKS)
+    with open(path) as f:
+        header, *rows = f.readlines()
+    with open(path, "w") as f:
+        f.writelines([header] + [row for row in rows if int(row.split(",")[0]) < 2])
+    resumed = sweep("square", 8, P_VALUES, 40, block_size=5, seed=12, store=store)
+    assert_same(full, resumed)
+    assert_same(full, sweep("square", 8, P_VALUES, 40, block_size=5, seed=12))
+
+
+def test_store_rejects_other_configuration(tmp_path):
+    store = str(tmp_path / "store")
+    sweep("square", 8, P_VALUES, 10, block_size=5, seed=1, store=store)
+    with pytest.raises(ValueError):
+        sweep("square", 16, P_VALUES, 10, block_size=5, seed=1, store=store)
+
+
+def test_read_results_prefers_store_with_blocks(tmp_path):
+    name = str(tmp_path / "square")
+    stats = sweep("square", 8, P_VALUES, 10, block_size=5, seed=3, store=name)
+    pd.DataFrame({"p": [0.5], "largest_components": [1.0]}).to_csv(name + ".csv", index=False)
+    pd.testing.assert_frame_equal(read_results(name), to_frame(P_VALUES, stats))
+
+
+def test_read_results_falls_back_to_csv_without_blocks(tmp_path):
+    name = str(tmp_path / "square")
+    open_store(name, {"lattice": "square", "L": 8, "p_values": P_VALUES.tolist(), "seed": 1})
+    assert read_results(name) is None
+    pd.DataFrame({"p": [0.5], "largest_components": [1.0]}).to_csv(name + ".csv", index=False)
+    assert list(read_results(name)["largest_components"]) == [1.0]
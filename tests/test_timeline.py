@@ -0,0 +1,28 @@
+import numpy as np
+
+from percolation.lattice import square_edges
+from percolation.labeling import label_clusters
+from percolation.timeline import build_timeline, timeline_labels, open_count
+
+
+def same_partition(a, b):
+    joint = np.unique(np.stack([a, b], axis=1), axis=0)
+    return len(joint) == len(np.unique(a)) == len(np.unique(b))
+
+
+def test_timeline_matches_fresh_labeling(each_backend):
+    L = 16
+    edges = square_edges(L)
+    thresholds = np.random.default_rng(4).random(len(edges))
+    timeline = build_timeline(L * L, edges, thresholds, num_snapshots=7)
+    for p in np.linspace(0, 1, 41):
+        fresh = label_clusters(L * L, edges[thresholds < p])
+        assert same_partition(timeline_labels(timeline, p), fresh)
+
+
+def test_open_count_is_the_threshold_prefix():
+    edges = square_edges(6)
+    thresholds = np.random.default_rng(1).random(len(edges))
+    timeline = build_timeline(36, edges, thresholds)
+    for p in (0.0, 0.3, 0.5, 1.0):
+        assert open_count(timeline, p) == np.sum(thresholds < p)